@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
 """Style the pandoc reference.pptx to match the Geist in the Machine theme."""
 
+from lxml import etree
 from pptx import Presentation
-from pptx.util import Inches, Pt, Emu
+from pptx.util import Pt
 from pptx.dml.color import RGBColor
-from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
-from pptx.oxml.ns import qn, nsmap
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import qn, nsdecls, nsmap
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
 import copy
+import functools
 
 # ─── Color Palette (matches slides-header.tex) ──────────────
 GEIST_PRIMARY = RGBColor(0x1B, 0x28, 0x38)   # Dark slate
@@ -20,173 +23,257 @@ FONT_HEADING = 'Helvetica Neue'
 FONT_BODY    = 'Helvetica Neue'
 FONT_MONO    = 'Fira Mono'
 
+PT_36 = Pt(36)
+PT_32 = Pt(32)
+PT_28 = Pt(28)
+PT_18 = Pt(18)
+PT_16 = Pt(16)
+
+# ─── Cached QNames (qn() re-parses prefix:localname on every call) ──
+_QN_CSLD       = qn('p:cSld')
+_QN_BG         = qn('p:bg')
+_QN_TXBODY     = qn('p:txBody')
+_QN_LATIN      = qn('a:latin')
+_QN_THEMEELEMENTS = qn('a:themeElements')
+_QN_CLRSCHEME  = qn('a:clrScheme')
+_QN_SRGBCLR    = qn('a:srgbClr')
+_QN_FONTSCHEME = qn('a:fontScheme')
+_QN_FONT_MAJOR = qn('a:majorFont')
+_QN_FONT_MINOR = qn('a:minorFont')
+_QN_COLORS = {name: qn(f'a:{name}') for name in (
+    'dk1', 'dk2', 'lt1', 'lt2', 'accent1', 'accent2',
+    'accent3', 'accent4', 'accent5', 'accent6', 'hlink', 'folHlink',
+)}
+
+# Every list-level defRPr under a txBody's lstStyle, compiled once
+_DEFRPR_XPATH = etree.XPath('./a:lstStyle/*/a:defRPr', namespaces=nsmap('a'))
+
+# Shared low-overhead parser (no xml:id index, no entities, no network)
+_XML_PARSER = etree.XMLParser(collect_ids=False, resolve_entities=False,
+                              no_network=True, huge_tree=False)
+
+# Theme color slots with their srgbClr hex values, formatted once at import
+_THEME_PALETTE = tuple((_QN_COLORS[name], str(rgb)) for name, rgb in (
+    ('dk1', GEIST_PRIMARY),    # Dark 1
+    ('dk2', GEIST_TEXT),       # Dark 2
+    ('lt1', WHITE),            # Light 1
+    ('lt2', GEIST_LIGHT),      # Light 2
+    ('accent1', GEIST_ACCENT), # Accent 1
+    ('accent2', GEIST_MID),    # Accent 2
+    ('accent3', RGBColor(0x27, 0xAE, 0x60)),  # Green
+    ('accent4', RGBColor(0xC0, 0x39, 0x2B)),  # Red
+    ('hlink', GEIST_ACCENT),   # Hyperlink
+    ('folHlink', GEIST_MID),   # Followed hyperlink
+))
+
+
+@functools.lru_cache(maxsize=None)
+def _bg_template(hex_val):
+    """A solid-fill <p:bg> for one color, built once and deep-copied per layout."""
+    return parse_xml(
+        f'<p:bg {nsdecls("p", "a")}><p:bgPr>'
+        f'<a:solidFill><a:srgbClr val="{hex_val}"/></a:solidFill><a:effectLst/>'
+        f'</p:bgPr></p:bg>'
+    )
+
 
 def set_slide_bg(slide_layout, color):
     """Set background color on a slide layout."""
-    bg = slide_layout.background
-    fill = bg.fill
-    fill.solid()
-    fill.fore_color.rgb = color
+    # Same XML python-pptx's background.fill.solid() + fore_color.rgb would
+    # produce, without walking its property chain for every layout
+    cSld = slide_layout._element.find(_QN_CSLD)
+    bg = cSld.find(_QN_BG)
+    if bg is not None:
+        cSld.remove(bg)
+    # p:bg must be the first child of p:cSld
+    cSld.insert(0, copy.deepcopy(_bg_template(str(color))))
+
+
+def make_styler(font_name=None, font_size=None, font_color=None,
+                bold=None, alignment=None):
+    """Bake one set of style_placeholder options into a styler(ph) function.
+
+    Which run properties to touch is decided once here rather than re-tested
+    for every run of every paragraph of every placeholder.
+    """
+    run_attrs = tuple((attr, value) for attr, value in
+                      (('name', font_name), ('size', font_size), ('bold', bold))
+                      if value is not None)
+    style_runs = bool(run_attrs) or font_color is not None
+
+    def styler(ph):
+        # Look txBody up once; a placeholder without one has no text frame to style
+        txBody = ph._sp.find(_QN_TXBODY)
+        if txBody is None:
+            return
+
+        if style_runs or alignment is not None:
+            for paragraph in ph.text_frame.paragraphs:
+                if alignment is not None:
+                    paragraph.alignment = alignment
+                if not style_runs:
+                    continue
+                for run in paragraph.runs:
+                    # Compare before assigning: layouts share most styles, and
+                    # each python-pptx setter rewrites rPr even for equal values
+                    font = run.font
+                    for attr, value in run_attrs:
+                        if getattr(font, attr) != value:
+                            setattr(font, attr, value)
+                    if font_color is not None:
+                        font.color.rgb = font_color
+
+        # Also set the default text style via XML for new text
+        if not font_name:
+            return
+        for defRPr in _DEFRPR_XPATH(txBody):
+            # Set latin font
+            latin = defRPr.find(_QN_LATIN)
+            if latin is not None:
+                if latin.get('typeface') != font_name:
+                    latin.set('typeface', font_name)
+            else:
+                etree.SubElement(defRPr, _QN_LATIN, typeface=font_name)
+
+    return styler
 
 
 def style_placeholder(ph, font_name=None, font_size=None, font_color=None,
                        bold=None, alignment=None):
     """Style a placeholder's default text properties."""
-    if ph.has_text_frame:
-        for paragraph in ph.text_frame.paragraphs:
-            if alignment is not None:
-                paragraph.alignment = alignment
-            for run in paragraph.runs:
-                if font_name:
-                    run.font.name = font_name
-                if font_size:
-                    run.font.size = font_size
-                if font_color:
-                    run.font.color.rgb = font_color
-                if bold is not None:
-                    run.font.bold = bold
-
-    # Also set the default text style via XML for new text
-    sp = ph._sp
-    txBody = sp.find(qn('p:txBody'))
-    if txBody is not None:
-        for defRPr_parent in txBody.findall(qn('a:lstStyle')):
-            for level in defRPr_parent:
-                defRPr = level.find(qn('a:defRPr'))
-                if defRPr is not None and font_name:
-                    # Set latin font
-                    latin = defRPr.find(qn('a:latin'))
-                    if latin is not None:
-                        latin.set('typeface', font_name)
-                    else:
-                        latin = defRPr.makeelement(qn('a:latin'), {'typeface': font_name})
-                        defRPr.append(latin)
-
+    make_styler(font_name, font_size, font_color, bold, alignment)(ph)
+
+
+# ─── Layout styling (kind -> placeholder idx -> pre-baked styler) ──
+# '_default' applies to any placeholder idx not listed explicitly.
+LAYOUT_BG = {
+    'title': GEIST_PRIMARY,        # Title slide - dark background
+    'section': GEIST_PRIMARY,      # Section header - dark background
+    'two_content': WHITE,          # Two-column layout
+    'blank': WHITE,
+    'default': WHITE,              # Content slides - white background
+}
+
+LAYOUT_STYLES = {
+    'title': {
+        0: make_styler(font_name=FONT_HEADING, font_size=PT_36, font_color=WHITE, bold=True),  # Title
+        1: make_styler(font_name=FONT_BODY, font_size=PT_18, font_color=GEIST_ACCENT),        # Subtitle
+    },
+    'section': {
+        0: make_styler(font_name=FONT_HEADING, font_size=PT_32, font_color=WHITE, bold=True),  # Title
+        '_default': make_styler(font_name=FONT_BODY, font_color=GEIST_ACCENT),
+    },
+    'two_content': {
+        0: make_styler(font_name=FONT_HEADING, font_size=PT_28, font_color=GEIST_PRIMARY, bold=True),
+        '_default': make_styler(font_name=FONT_BODY, font_size=PT_16, font_color=GEIST_TEXT),
+    },
+    'blank': {},
+    'default': {
+        0: make_styler(font_name=FONT_HEADING, font_size=PT_28, font_color=GEIST_PRIMARY, bold=True),  # Title
+        1: make_styler(font_name=FONT_BODY, font_size=PT_18, font_color=GEIST_TEXT),                   # Body/content
+    },
+}
 
 def update_theme_colors(prs):
     """Update the theme color scheme to match our palette."""
-    from lxml import etree
-
     # Access the slide master's theme
     slide_master = prs.slide_masters[0]
 
     # Find theme XML through the relationship
-    for rel in slide_master.part.rels.values():
-        if 'theme' in rel.reltype:
-            theme_element = etree.fromstring(rel.target_part.blob)
-            theme_part_ref = rel.target_part
-
-            # Find the color scheme
-            theme_elements = theme_element.findall('.//' + qn('a:clrScheme'))
-            for clr_scheme in theme_elements:
-                # Update specific theme colors
-                color_map = {
-                    'dk1': GEIST_PRIMARY,    # Dark 1
-                    'dk2': GEIST_TEXT,       # Dark 2
-                    'lt1': WHITE,            # Light 1
-                    'lt2': GEIST_LIGHT,      # Light 2
-                    'accent1': GEIST_ACCENT, # Accent 1
-                    'accent2': GEIST_MID,    # Accent 2
-                    'accent3': RGBColor(0x27, 0xAE, 0x60),  # Green
-                    'accent4': RGBColor(0xC0, 0x39, 0x2B),  # Red
-                    'hlink': GEIST_ACCENT,   # Hyperlink
-                    'folHlink': GEIST_MID,   # Followed hyperlink
-                }
-
-                for color_name, rgb in color_map.items():
-                    el = clr_scheme.find(qn(f'a:{color_name}'))
-                    if el is not None:
-                        # Remove existing color children
-                        for child in list(el):
-                            el.remove(child)
-                        # Add srgbClr
-                        srgb = el.makeelement(qn('a:srgbClr'), {'val': str(rgb)})
-                        el.append(srgb)
-
-            # Update font scheme
-            font_schemes = theme_element.findall('.//' + qn('a:fontScheme'))
-            for font_scheme in font_schemes:
-                for font_type in ['majorFont', 'minorFont']:
-                    font_el = font_scheme.find(qn(f'a:{font_type}'))
-                    if font_el is not None:
-                        latin = font_el.find(qn('a:latin'))
-                        if latin is not None:
-                            typeface = FONT_HEADING if font_type == 'majorFont' else FONT_BODY
-                            latin.set('typeface', typeface)
-
-            # Save modified theme back
-            theme_part_ref._blob = etree.tostring(theme_element, xml_declaration=True,
-                                                   encoding='UTF-8', standalone=True)
-            break
+    theme_rel = next((rel for rel in slide_master.part.rels.values()
+                      if rel.reltype == RT.THEME), None)
+    if theme_rel is None:
+        return
+    theme_part_ref = theme_rel.target_part
+
+    # An XmlPart already holds the parsed tree and serializes it on save, so
+    # mutate that in place. Stock python-pptx loads themes as a blob-only Part,
+    # which still needs the parse here and the write-back below.
+    theme_element = getattr(theme_part_ref, '_element', None)
+    is_xml_part = theme_element is not None
+    if not is_xml_part:
+        theme_element = etree.fromstring(theme_part_ref.blob, _XML_PARSER)
+
+    # clrScheme and fontScheme are direct children of a:themeElements,
+    # so look them up there rather than walking the whole theme tree
+    theme_elements = theme_element.find(_QN_THEMEELEMENTS)
+    if theme_elements is None:
+        return
+
+    # Only re-serialize the part if something actually changed (a
+    # re-run over an already styled reference.pptx is a no-op)
+    changed = False
+
+    # Find the color scheme
+    clr_scheme = theme_elements.find(_QN_CLRSCHEME)
+    if clr_scheme is not None:
+        for color_qn, hex_val in _THEME_PALETTE:
+            el = clr_scheme.find(color_qn)
+            if el is not None:
+                if (len(el) == 1 and el[0].tag == _QN_SRGBCLR
+                        and el[0].get('val') == hex_val):
+                    continue
+                changed = True
+                # Drop existing color children in one call (keeps el's attributes)
+                el[:] = []
+                # Add srgbClr
+                etree.SubElement(el, _QN_SRGBCLR, val=hex_val)
+
+    # Update font scheme
+    font_scheme = theme_elements.find(_QN_FONTSCHEME)
+    if font_scheme is not None:
+        for font_qn, typeface in ((_QN_FONT_MAJOR, FONT_HEADING),
+                                  (_QN_FONT_MINOR, FONT_BODY)):
+            font_el = font_scheme.find(font_qn)
+            if font_el is not None:
+                latin = font_el.find(_QN_LATIN)
+                if latin is not None and latin.get('typeface') != typeface:
+                    latin.set('typeface', typeface)
+                    changed = True
+
+    # Save modified theme back
+    if changed and not is_xml_part:
+        theme_part_ref._blob = etree.tostring(theme_element, xml_declaration=True,
+                                               encoding='UTF-8', standalone=True)
+
+
+def classify_layout(layout_name):
+    """Map a lowercased layout name to its LAYOUT_STYLES key."""
+    if 'title' in layout_name and 'content' not in layout_name:
+        return 'title'
+    if 'section' in layout_name:
+        return 'section'
+    if 'two' in layout_name and 'content' in layout_name:
+        return 'two_content'
+    if 'blank' in layout_name:
+        return 'blank'
+    return 'default'
 
 
 def main():
+    # python-pptx parses its registered XML parts with its own oxml parser;
+    # this covers every other lxml parse made while opening the package
+    etree.set_default_parser(_XML_PARSER)
     prs = Presentation('reference.pptx')
 
     # Update theme colors
     update_theme_colors(prs)
 
-    # Style each slide layout
+    # Style each slide layout: one pass per layout, one dict lookup per placeholder
     slide_master = prs.slide_masters[0]
 
     for layout in slide_master.slide_layouts:
-        layout_name = layout.name.lower()
-
-        if 'title' in layout_name and 'content' not in layout_name:
-            # Title slide - dark background
-            set_slide_bg(layout, GEIST_PRIMARY)
-
-            for ph in layout.placeholders:
-                if ph.placeholder_format.idx == 0:  # Title
-                    style_placeholder(ph, font_name=FONT_HEADING,
-                                     font_size=Pt(36), font_color=WHITE,
-                                     bold=True)
-                elif ph.placeholder_format.idx == 1:  # Subtitle
-                    style_placeholder(ph, font_name=FONT_BODY,
-                                     font_size=Pt(18), font_color=GEIST_ACCENT)
-
-        elif 'section' in layout_name:
-            # Section header - dark background
-            set_slide_bg(layout, GEIST_PRIMARY)
-
-            for ph in layout.placeholders:
-                if ph.placeholder_format.idx == 0:  # Title
-                    style_placeholder(ph, font_name=FONT_HEADING,
-                                     font_size=Pt(32), font_color=WHITE,
-                                     bold=True)
-                else:
-                    style_placeholder(ph, font_name=FONT_BODY,
-                                     font_color=GEIST_ACCENT)
-
-        elif 'two' in layout_name and 'content' in layout_name:
-            # Two-column layout
-            set_slide_bg(layout, WHITE)
-            for ph in layout.placeholders:
-                if ph.placeholder_format.idx == 0:  # Title
-                    style_placeholder(ph, font_name=FONT_HEADING,
-                                     font_size=Pt(28), font_color=GEIST_PRIMARY,
-                                     bold=True)
-                else:
-                    style_placeholder(ph, font_name=FONT_BODY,
-                                     font_size=Pt(16), font_color=GEIST_TEXT)
-
-        elif 'blank' in layout_name:
-            set_slide_bg(layout, WHITE)
-
-        else:
-            # Content slides - white background
-            set_slide_bg(layout, WHITE)
-
-            for ph in layout.placeholders:
-                idx = ph.placeholder_format.idx
-                if idx == 0:  # Title
-                    style_placeholder(ph, font_name=FONT_HEADING,
-                                     font_size=Pt(28), font_color=GEIST_PRIMARY,
-                                     bold=True)
-                    # Add bottom border to title area via shape properties
-                elif idx == 1:  # Body/content
-                    style_placeholder(ph, font_name=FONT_BODY,
-                                     font_size=Pt(18), font_color=GEIST_TEXT)
+        kind = classify_layout(layout.name.lower())
+        set_slide_bg(layout, LAYOUT_BG[kind])
+
+        styles = LAYOUT_STYLES[kind]
+        if not styles:
+            continue
+        default = styles.get('_default')
+        for ph in layout.placeholders:
+            styler = styles.get(ph.placeholder_format.idx, default)
+            if styler is not None:
+                styler(ph)
 
     # Style the slide master itself
     set_slide_bg(slide_master, WHITE)
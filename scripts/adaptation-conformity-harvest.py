@@ -320,7 +320,8 @@ def main():
             skipped["no_file"] += 1
             continue
         try:
-            d = json.load(open(fp))
+            with open(fp, "rb") as fh:
+                d = json.loads(fh.read())
         except Exception:
             skipped["bad_json"] += 1
             continue
@@ -329,7 +329,8 @@ def main():
         if not os.path.exists(fp):
             skipped["no_file"] += 1; continue
         try:
-            d = json.load(open(fp))
+            with open(fp, "rb") as fh:
+                d = json.loads(fh.read())
         except Exception:
             skipped["bad_json"] += 1; continue
         tr = d.get("dialogueTrace") or d.get("trace") or []
@@ -222,7 +222,8 @@ def main():
             continue
         seen_files.add(fp)
         try:
-            d = json.load(open(fp))
+            with open(fp, "rb") as fh:
+                d = json.loads(fh.read())
         except Exception:
             skipped["bad_json"] += 1; continue
         tr = d.get("dialogueTrace") or d.get("trace") or []
@@ -7,6 +7,11 @@ Creates two publication-quality figures for Paper 2.0:
   2. figure-mechanism-isolation.png       - M1/M2 2x2 isolation (§6.4.2)
 
 Run: python3 scripts/generate-m3-m2-figures.py
+Release build: FIG_PNG_COMPRESS=9 python3 scripts/generate-m3-m2-figures.py
+
+Each PNG records a hash of this script, the database mtime and the PNG
+compression; figures whose hash still matches are skipped. Pass --force to
+rebuild them anyway.
 """
 
 import matplotlib
@@ -14,17 +19,24 @@ matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
+from PIL import Image
+import argparse
 import sqlite3
+import functools
+import hashlib
 import json
 import os
 import sys
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 # ── Configuration ────────────────────────────────────────────────────────────
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(SCRIPT_DIR, '..', 'data', 'evaluations.db')
 FIGURES_DIR = os.path.join(SCRIPT_DIR, '..', 'docs', 'research', 'figures')
+# zlib level for the PNG encoder; 1 is several times faster than the default 6
+PNG_COMPRESS = int(os.environ.get('FIG_PNG_COMPRESS', '1'))
 
 # Match generate-paper2-figures.py styling exactly
 plt.rcParams.update({
@@ -43,7 +55,6 @@ plt.rcParams.update({
     'grid.alpha': 0.3,
     'grid.linewidth': 0.5,
     'savefig.facecolor': 'white',
-    'savefig.bbox': 'tight',
     'savefig.dpi': 200,
 })
 
@@ -53,40 +64,99 @@ DARK_GREEN = '#1a7a3a'
 SINGLE_COLOR = '#9b59b6'
 MULTI_COLOR = '#1abc9c'
 
+# Shared annotation styles, built once instead of parsing style strings per call
+LABEL_BOX = mpatches.BoxStyle('Round', pad=0.2)
+NOTE_BOX = mpatches.BoxStyle('Round', pad=0.3)
+ARROW = mpatches.ArrowStyle('->')
+
 M3_RUN = 'eval-2026-03-06-ebcd6de0'
 M2_RUN = 'eval-2026-03-06-768ba77b'
 M1_RUN = 'eval-2026-03-06-e4abd0df'
 
+TRAJECTORY_SCENARIOS = (
+    'Trajectory: Confusion → Insight Arc (8-turn)',
+    'Trajectory: Disengagement → Ownership Arc (10-turn)',
+    'Trajectory: Overconfidence → Humility Arc (8-turn)',
+)
+
+# Mechanism-isolation conditions: (label, profile_name prefixes of its two cells)
+MECHANISM_CONDITIONS = (
+    ('Neither\n(base, single)', ('cell_80', 'cell_81')),
+    ('M2 only\n(base + superego)', ('cell_82', 'cell_83')),
+    ('M1 only\n(recog, no superego)', ('cell_84', 'cell_85')),
+    ('Both\n(recog + superego)', ('cell_86', 'cell_87')),
+)
+
 
 def get_db():
-    conn = sqlite3.connect(f'file:{DB_PATH}?mode=ro', uri=True)
-    conn.row_factory = sqlite3.Row
-    return conn
+    # Plain tuple rows: every query here is unpacked positionally
+    return sqlite3.connect(f'file:{DB_PATH}?mode=ro', uri=True)
 
 
-# ── Figure 1: Disengagement Trajectory Divergence (§6.3.2) ──────────────────
+def load_run_data():
+    """Every M3 run row either figure draws from, in one query.
 
-def figure_disengagement_divergence():
-    """Two-panel figure: (a) per-turn trajectories, (b) gap widening."""
+    Returns (profile_name, scenario_name, tutor_scores, tutor_first_turn_score)
+    tuples; each figure filters for the scenarios and scores it needs.
+    """
     db = get_db()
-
-    # Load all rows from the disengagement scenario
     rows = db.execute("""
-        SELECT profile_name, tutor_scores
+        SELECT profile_name, scenario_name, tutor_scores, tutor_first_turn_score
         FROM evaluation_results
         WHERE run_id = ?
-          AND scenario_name LIKE '%Disengagement%'
-          AND tutor_scores IS NOT NULL
     """, (M3_RUN,)).fetchall()
     db.close()
+    return rows
+
+
+def output_path(fn):
+    """PNG path for figure function ``fn``."""
+    return os.path.join(FIGURES_DIR, fn.__name__.replace('_', '-') + '.png')
+
+
+@functools.lru_cache(maxsize=1)
+def render_key():
+    """Hash of everything the output PNGs depend on, computed once per process."""
+    h = hashlib.blake2b(digest_size=8)
+    with open(__file__, 'rb') as f:
+        h.update(f.read())
+    h.update(repr((os.path.getmtime(DB_PATH), PNG_COMPRESS)).encode())
+    return h.hexdigest()
+
+
+def is_current(fn, key):
+    """True if figure function ``fn``'s PNG was rendered from the inputs hashed in ``key``."""
+    try:
+        with Image.open(output_path(fn)) as im:
+            return im.text.get('Source-Hash') == key
+    except OSError:
+        return False
+
+
+def save(fn):
+    """Save the current pyplot figure as figure function ``fn``'s PNG.
+
+    ``fn`` names the output file, so each figure passes itself in.
+    """
+    path = output_path(fn)
+    plt.savefig(path, metadata={'Source-Hash': render_key()},
+                pil_kwargs={'compress_level': PNG_COMPRESS})
+    plt.close()
+    print(f'  -> {path}')
+
+
+# ── Figure 1: Disengagement Trajectory Divergence (§6.3.2) ──────────────────
 
-    # Extract per-turn scores by condition
+def figure_disengagement_divergence(rows):
+    """Two-panel figure: (a) per-turn trajectories, (b) gap widening."""
+    # Extract per-turn scores by condition from the disengagement scenario
     base_turns = defaultdict(list)
     recog_turns = defaultdict(list)
 
-    for row in rows:
-        profile = row['profile_name']
-        ts = json.loads(row['tutor_scores'])
+    for profile, scenario, tutor_scores, _ in rows:
+        if tutor_scores is None or 'disengagement' not in (scenario or '').lower():
+            continue
+        ts = json.loads(tutor_scores)
         is_recog = 'recog' in profile
         target = recog_turns if is_recog else base_turns
         for turn_key, turn_data in ts.items():
@@ -102,7 +172,7 @@ def figure_disengagement_divergence():
     recog_sems = [np.std(recog_turns[t]) / np.sqrt(len(recog_turns[t])) for t in turns]
     gaps = [r - b for r, b in zip(recog_means, base_means)]
 
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(13, 5.5),
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(13, 5.5), layout='constrained',
                                     gridspec_kw={'width_ratios': [3, 2]})
 
     # ── Panel (a): Per-turn trajectories ──
@@ -125,7 +195,7 @@ def figure_disengagement_divergence():
     ax1.annotate('Late-stage\nrecognition surge',
                 xy=(9, 70), fontsize=9, color=DARK_GREEN,
                 ha='center', style='italic',
-                bbox=dict(boxstyle='round,pad=0.3', facecolor='#e8f5e9', alpha=0.8))
+                bbox=dict(boxstyle=NOTE_BOX, facecolor='#e8f5e9', alpha=0.8))
 
     # Annotate T0 and T10 values
     ax1.annotate(f'{recog_means[0]:.0f}', (0, recog_means[0]),
@@ -152,14 +222,14 @@ def figure_disengagement_divergence():
     colors = ['#b0bec5'] * 8 + [RECOG_COLOR] * 3  # Gray early, green late
     bars = ax2.bar(turns, gaps, color=colors, edgecolor='white', linewidth=0.5)
 
-    # Annotate key gaps
-    for t in [0, 7, 8, 9, 10]:
-        if t <= max_turn:
-            ax2.annotate(f'{gaps[t]:+.0f}',
-                        (t, gaps[t]), textcoords='offset points',
-                        xytext=(0, 5), ha='center', fontsize=8,
-                        fontweight='bold' if t >= 8 else 'normal',
-                        color=DARK_GREEN if t >= 8 else '#555')
+    # Annotate key gaps; the late-stage ones in bold green. annotation_clip=False
+    # keeps a label drawn, as ax.text did, when its bar ends above the fixed ylim
+    key_turns = (0, 7, 8, 9, 10)
+    gap_labels = ax2.bar_label(bars, labels=[f'{gaps[t]:+.0f}' if t in key_turns else ''
+                                             for t in turns],
+                               padding=5, fontsize=8, color='#555', annotation_clip=False)
+    for label in gap_labels[8:]:
+        label.set(fontweight='bold', color=DARK_GREEN)
 
     # Add a horizontal line at mean early gap
     early_gap = np.mean(gaps[:8])
@@ -180,62 +250,28 @@ def figure_disengagement_divergence():
     ax2.set_ylim(-5, 45)
 
     fig.suptitle('Disengagement to Ownership: Conditional M3 Effect (10-turn, N=24)',
-                 fontsize=14, fontweight='bold', y=1.02)
-    fig.text(0.5, -0.02,
-             'Recognition produces steeper improvement (d = 1.63, p < .001). '
-             'The gap widens from +12 pts (T0) to +35 pts (T8-T10) during the '
-             'designed ownership transition.',
-             ha='center', fontsize=9, color='gray', style='italic')
-
-    plt.tight_layout()
-    path = os.path.join(FIGURES_DIR, 'figure-disengagement-divergence.png')
-    plt.savefig(path, bbox_inches='tight')
-    plt.close()
-    print(f'  -> {path}')
+                 fontsize=14, fontweight='bold')
+    # supxlabel rather than fig.text: the constrained layout reserves room for
+    # it, so nothing falls outside the canvas and savefig needs no tight bbox
+    fig.supxlabel('Recognition produces steeper improvement (d = 1.63, p < .001). '
+                  'The gap widens from +12 pts (T0) to +35 pts (T8-T10) during the '
+                  'designed ownership transition.',
+                  fontsize=9, color='gray', style='italic')
+
+    save(figure_disengagement_divergence)
 
 
 # ── Figure 2: Mechanism Isolation 2×2 (§6.4.2) ──────────────────────────────
 
-def figure_mechanism_isolation():
+def figure_mechanism_isolation(rows):
     """2x2 bar chart: Neither / M2 only / M1 only / Both."""
-    db = get_db()
-
-    trajectory_scenarios = [
-        'Trajectory: Confusion → Insight Arc (8-turn)',
-        'Trajectory: Disengagement → Ownership Arc (10-turn)',
-        'Trajectory: Overconfidence → Humility Arc (8-turn)',
-    ]
-
-    conditions = {
-        'Neither\n(base, single)': {
-            'run': M3_RUN, 'cells': ('cell_80%', 'cell_81%'),
-        },
-        'M2 only\n(base + superego)': {
-            'run': M3_RUN, 'cells': ('cell_82%', 'cell_83%'),
-        },
-        'M1 only\n(recog, no superego)': {
-            'run': M3_RUN, 'cells': ('cell_84%', 'cell_85%'),
-        },
-        'Both\n(recog + superego)': {
-            'run': M3_RUN, 'cells': ('cell_86%', 'cell_87%'),
-        },
+    scored = [(profile, score) for profile, scenario, _, score in rows
+              if scenario in TRAJECTORY_SCENARIOS and score is not None]
+    cond_scores = {
+        label: [score for profile, score in scored if profile.startswith(cells)]
+        for label, cells in MECHANISM_CONDITIONS
     }
 
-    cond_scores = {}
-    for label, spec in conditions.items():
-        scores = []
-        for cell_pat in spec['cells']:
-            for scen in trajectory_scenarios:
-                rows = db.execute("""
-                    SELECT tutor_first_turn_score FROM evaluation_results
-                    WHERE run_id = ? AND profile_name LIKE ? AND scenario_name = ?
-                      AND tutor_first_turn_score IS NOT NULL
-                """, (spec['run'], cell_pat, scen)).fetchall()
-                scores.extend([r['tutor_first_turn_score'] for r in rows])
-        cond_scores[label] = scores
-
-    db.close()
-
     labels = list(cond_scores.keys())
     means = [np.mean(s) for s in cond_scores.values()]
     sems = [np.std(s) / np.sqrt(len(s)) for s in cond_scores.values()]
@@ -244,48 +280,54 @@ def figure_mechanism_isolation():
     # Colors: gray for neither, teal for M2, green for M1, blend for both
     bar_colors = [BASE_COLOR, MULTI_COLOR, RECOG_COLOR, DARK_GREEN]
 
-    fig, ax = plt.subplots(figsize=(8, 5.5))
+    fig, ax = plt.subplots(figsize=(8, 5.5), layout='constrained')
 
     x = np.arange(len(labels))
     bars = ax.bar(x, means, yerr=sems, capsize=5, color=bar_colors,
                   edgecolor='white', linewidth=1.5, width=0.65,
                   error_kw={'linewidth': 1.5, 'color': '#555'})
 
-    # Value labels on bars
-    for i, (bar, mean, n) in enumerate(zip(bars, means, ns)):
-        ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 1.5,
-                f'{mean:.1f}', ha='center', va='bottom', fontsize=12,
-                fontweight='bold', color=bar_colors[i])
+    # Value labels above the error bars, in each bar's color; kept drawn even if
+    # the error bar ends above the fixed ylim
+    for label, color in zip(ax.bar_label(bars, labels=[f'{m:.1f}' for m in means],
+                                         padding=3, fontsize=12, fontweight='bold',
+                                         annotation_clip=False),
+                            bar_colors):
+        label.set_color(color)
+    # N labels sit at the foot of each bar, which bar_label has no position for
+    for bar, n in zip(bars, ns):
         ax.text(bar.get_x() + bar.get_width() / 2, 2,
                 f'n={n}', ha='center', va='bottom', fontsize=9, color='white',
                 fontweight='bold')
 
-    # Annotate the deltas
+    # Annotate the deltas. Three arrows with distinct colors, an arc and a
+    # label box each: a LineCollection would not reproduce them, so they stay
+    # individual annotate() calls.
     # M2 effect under base: Neither -> M2
     mid_m2 = (means[0] + means[1]) / 2
     ax.annotate('', xy=(1, means[1] - 0.5), xytext=(0, means[0] + 0.5),
-               arrowprops=dict(arrowstyle='->', color=MULTI_COLOR, lw=1.5))
+               arrowprops=dict(arrowstyle=ARROW, color=MULTI_COLOR, lw=1.5))
     ax.text(0.5, mid_m2 - 4, f'+{means[1]-means[0]:.1f}\nd=1.13',
             ha='center', va='center', fontsize=9, color=MULTI_COLOR,
             fontweight='bold',
-            bbox=dict(boxstyle='round,pad=0.2', facecolor='white', alpha=0.9))
+            bbox=dict(boxstyle=LABEL_BOX, facecolor='white', alpha=0.9))
 
     # M1 effect: Neither -> M1 (arc above)
     ax.annotate('', xy=(2, means[2] + 2), xytext=(0, means[0] + 2),
-               arrowprops=dict(arrowstyle='->', color=RECOG_COLOR, lw=1.5,
+               arrowprops=dict(arrowstyle=ARROW, color=RECOG_COLOR, lw=1.5,
                               connectionstyle='arc3,rad=-0.3'))
     ax.text(1.0, means[2] + 8, f'+{means[2]-means[0]:.1f}\nd=1.85',
             ha='center', va='center', fontsize=9, color=DARK_GREEN,
             fontweight='bold',
-            bbox=dict(boxstyle='round,pad=0.2', facecolor='#e8f5e9', alpha=0.9))
+            bbox=dict(boxstyle=LABEL_BOX, facecolor='#e8f5e9', alpha=0.9))
 
     # M2 effect under recognition: M1 -> Both
     residual = means[3] - means[2]
     ax.annotate(f'+{residual:.1f} (NS)',
                xy=(3, means[3] + 2), xytext=(3, means[3] + 9),
                fontsize=9, color='#777', ha='center',
-               arrowprops=dict(arrowstyle='->', color='#999', lw=1),
-               bbox=dict(boxstyle='round,pad=0.2', facecolor='white', alpha=0.8))
+               arrowprops=dict(arrowstyle=ARROW, color='#999', lw=1),
+               bbox=dict(boxstyle=LABEL_BOX, facecolor='white', alpha=0.8))
 
     ax.set_xticks(x)
     ax.set_xticklabels(labels, fontsize=10)
@@ -294,32 +336,54 @@ def figure_mechanism_isolation():
 
     ax.set_title('Mechanism Isolation: Calibration Dominates, Superego Pre-empted',
                 fontsize=13, fontweight='bold')
-    fig.text(0.5, -0.02,
-             'The superego adds +9.2 pts under base (d = 1.13, p = .002) but only +1.1 '
-             'under recognition (NS). Calibration pre-empts 88% of error correction. '
-             'DeepSeek V3.2, Sonnet judge, 3 trajectory scenarios.',
-             ha='center', fontsize=9, color='gray', style='italic')
-
-    plt.tight_layout()
-    path = os.path.join(FIGURES_DIR, 'figure-mechanism-isolation.png')
-    plt.savefig(path, bbox_inches='tight')
-    plt.close()
-    print(f'  -> {path}')
+    fig.supxlabel('The superego adds +9.2 pts under base (d = 1.13, p = .002) but only +1.1 '
+                  'under recognition (NS).\nCalibration pre-empts 88% of error correction. '
+                  'DeepSeek V3.2, Sonnet judge, 3 trajectory scenarios.',
+                  fontsize=9, color='gray', style='italic')
+
+    save(figure_mechanism_isolation)
 
 
 # ── Main ─────────────────────────────────────────────────────────────────────
 
+FIGURES = (figure_disengagement_divergence, figure_mechanism_isolation)
+
+
+_ROWS = []
+
+
+def _init_worker(rows):
+    """Pool initializer: keep the run's rows in the worker for _render."""
+    _ROWS[:] = rows
+
+
+def _render(fn):
+    """Pool task: draw figure function ``fn`` from the worker's rows."""
+    fn(_ROWS)
+
+
 def main():
+    parser = argparse.ArgumentParser(description='Generate the M3/M2 isolation figures.')
+    parser.add_argument('--force', action='store_true',
+                        help='rebuild every figure even if its PNG is up to date')
+    args = parser.parse_args()
+
     os.makedirs(FIGURES_DIR, exist_ok=True)
 
     if not os.path.exists(DB_PATH):
         print(f'ERROR: Database not found at {DB_PATH}')
         sys.exit(1)
 
+    key = render_key()
+    stale = [fn for fn in FIGURES if args.force or not is_current(fn, key)]
     print('Generating M3/M2 isolation figures...\n')
-    figure_disengagement_divergence()
-    figure_mechanism_isolation()
-    print(f'\nDone. 2 figures generated in {FIGURES_DIR}/')
+    # Both figures draw from one run, so it is read once here and handed to
+    # each worker; the figures then render independently, one per process
+    if stale:
+        with ProcessPoolExecutor(max_workers=len(stale), initializer=_init_worker,
+                                 initargs=(load_run_data(),)) as ex:
+            list(ex.map(_render, stale))
+    print(f'\nDone. {len(stale)} of {len(FIGURES)} figures generated in {FIGURES_DIR}/')
 
 
 if __name__ == '__main__':
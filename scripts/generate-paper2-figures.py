@@ -6,6 +6,11 @@ Creates publication-quality charts from cells 80-87, v2.2 rubric data.
 All figures are written to docs/research/figures/ with descriptive names.
 
 Run: python3 scripts/generate-paper2-figures.py
+Release build: FIG_PNG_COMPRESS=9 python3 scripts/generate-paper2-figures.py
+
+Each PNG records a hash of this script, the database mtime and the PNG
+compression; figures whose hash still matches are skipped. Pass --force to
+rebuild them anyway.
 
 Figures generated:
   1. figure-calibration-variance.png      - Within-response dimension variance (§6.1.1)
@@ -22,23 +27,32 @@ Figures generated:
 
 import matplotlib
 matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import numpy as np
+from PIL import Image
+import argparse
+import functools
+import hashlib
 import sqlite3
 import json
 import os
 import sys
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 # ── Configuration ────────────────────────────────────────────────────────────
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(SCRIPT_DIR, '..', 'data', 'evaluations.db')
 FIGURES_DIR = os.path.join(SCRIPT_DIR, '..', 'docs', 'research', 'figures')
+# zlib level for the PNG encoder; 1 is several times faster than the default 6
+PNG_COMPRESS = int(os.environ.get('FIG_PNG_COMPRESS', '1'))
+PNG_KWARGS = {'compress_level': PNG_COMPRESS}
 
 # Consistent publication styling
-plt.rcParams.update({
+matplotlib.rcParams.update({
     'font.family': 'sans-serif',
     'font.sans-serif': ['Helvetica Neue', 'Arial', 'DejaVu Sans'],
     'font.size': 11,
@@ -70,6 +84,66 @@ LEARNER_COLOR = '#e74c3c'    # Red for learner
 DARK_GREEN = '#1a7a3a'
 DARK_RED = '#c0392b'
 
+# Shared box styles for annotation backgrounds, built once instead of parsing
+# a 'round,pad=...' string for every label
+LABEL_BOX = mpatches.BoxStyle('Round', pad=0.2)
+NOTE_BOX = mpatches.BoxStyle('Round', pad=0.3)
+
+
+_FIG = None
+
+
+def new_figure(nrows=1, ncols=1, figsize=None, **kwargs):
+    """Pyplot-free equivalent of plt.subplots() on this process's shared Figure.
+
+    The Figure is never registered with pyplot's figure manager, and since a
+    worker renders its figures one at a time, the same Figure and Agg canvas
+    are cleared and resized for each one instead of being rebuilt.
+    """
+    global _FIG
+    if _FIG is None:
+        _FIG = Figure(figsize=figsize)
+        FigureCanvasAgg(_FIG)
+    else:
+        _FIG.clear()
+        _FIG.set_size_inches(figsize or matplotlib.rcParams['figure.figsize'])
+    return _FIG, _FIG.subplots(nrows, ncols, **kwargs)
+
+
+def output_path(fn):
+    """PNG path for figure function ``fn``."""
+    return os.path.join(FIGURES_DIR, fn.__name__.replace('_', '-') + '.png')
+
+
+@functools.lru_cache(maxsize=1)
+def render_key():
+    """Hash of everything the output PNGs depend on, computed once per process."""
+    h = hashlib.blake2b(digest_size=8)
+    with open(__file__, 'rb') as f:
+        h.update(f.read())
+    h.update(repr((os.path.getmtime(DB_PATH), PNG_COMPRESS)).encode())
+    return h.hexdigest()
+
+
+def is_current(fn, key):
+    """True if figure function ``fn``'s PNG was rendered from the inputs hashed in ``key``."""
+    try:
+        with Image.open(output_path(fn)) as im:
+            return im.text.get('Source-Hash') == key
+    except OSError:
+        return False
+
+
+def save(fig, fn):
+    """Write ``fig`` as figure function ``fn``'s PNG, stamped with the current render key.
+
+    ``fn`` names the output file, so each figure passes itself in.
+    """
+    path = output_path(fn)
+    fig.savefig(path, bbox_inches='tight', metadata={'Source-Hash': render_key()},
+                pil_kwargs=PNG_KWARGS)
+    print(f'  -> {path}')
+
 
 # ── Data Loading ─────────────────────────────────────────────────────────────
 
@@ -80,32 +154,18 @@ def get_db():
     return conn
 
 
-def load_factorial_data():
-    """Load all v2.2 cells 80-87 data for DeepSeek and Haiku."""
-    db = get_db()
-    rows = db.execute("""
-        SELECT id, profile_name, ego_model,
-               tutor_first_turn_score, tutor_last_turn_score,
-               tutor_overall_score,
-               learner_overall_score, learner_holistic_overall_score,
-               dialogue_quality_score,
-               tutor_scores, learner_scores,
-               scores_with_reasoning,
-               tutor_deliberation_scores, tutor_deliberation_score,
-               scenario_id
-        FROM evaluation_results
-        WHERE tutor_rubric_version = '2.2'
-          AND tutor_first_turn_score IS NOT NULL
-          AND profile_name LIKE 'cell_8%'
-          AND (ego_model LIKE '%deepseek%' OR ego_model LIKE '%haiku%')
-    """).fetchall()
-    db.close()
-    return rows
+def load_evaluation_data():
+    """Load all v2.2 cells 80-87 data for both figure datasets in one query.
 
-
-def load_all_models_data():
-    """Load all v2.2 cells 80-87 data for DeepSeek, Haiku, AND Gemini Flash (Sonnet judge)."""
+    Returns ``(rows, all_rows)``: ``rows`` is DeepSeek and Haiku under any
+    judge; ``all_rows`` is DeepSeek, Haiku, AND Gemini Flash (Sonnet judge).
+    The two overlap heavily, so one scan fetches their union and the split
+    happens here; the filters mirror SQLite's case-insensitive LIKE.
+    """
     db = get_db()
+    # GLOB rather than LIKE for the cells: GLOB is case-sensitive, so SQLite
+    # turns the prefix into a range scan on idx_results_profile instead of
+    # scanning every evaluation_results row.
     rows = db.execute("""
         SELECT id, profile_name, ego_model,
                tutor_first_turn_score, tutor_last_turn_score,
@@ -115,16 +175,18 @@ def load_all_models_data():
                tutor_scores, learner_scores,
                scores_with_reasoning,
                tutor_deliberation_scores, tutor_deliberation_score,
-               scenario_id
+               scenario_id, judge_model
         FROM evaluation_results
         WHERE tutor_rubric_version = '2.2'
           AND tutor_first_turn_score IS NOT NULL
-          AND profile_name LIKE 'cell_8%'
-          AND judge_model LIKE '%sonnet%'
+          AND profile_name GLOB 'cell_8*'
           AND (ego_model LIKE '%deepseek%' OR ego_model LIKE '%haiku%' OR ego_model LIKE '%gemini%')
     """).fetchall()
     db.close()
-    return rows
+    factorial = [r for r in rows
+                 if 'deepseek' in r['ego_model'].lower() or 'haiku' in r['ego_model'].lower()]
+    all_models = [r for r in rows if 'sonnet' in (r['judge_model'] or '').lower()]
+    return factorial, all_models
 
 
 def classify_row(row):
@@ -166,11 +228,9 @@ def extract_per_turn_scores(row, column='tutor_scores'):
     """Extract per-turn overall scores from tutor_scores/learner_scores JSON."""
     try:
         data = json.loads(row[column] or '{}')
-        turns = {}
-        for turn_key, turn_data in data.items():
-            if isinstance(turn_data, dict) and 'overallScore' in turn_data:
-                turns[int(turn_key)] = turn_data['overallScore']
-        return turns
+        return {int(turn_key): turn_data['overallScore']
+                for turn_key, turn_data in data.items()
+                if isinstance(turn_data, dict) and 'overallScore' in turn_data}
     except (json.JSONDecodeError, TypeError):
         return {}
 
@@ -182,10 +242,9 @@ def extract_per_turn_dimension_scores(row, column='tutor_scores'):
         turns = {}
         for turn_key, turn_data in data.items():
             if isinstance(turn_data, dict) and 'scores' in turn_data:
-                scores = {}
-                for dim, info in turn_data['scores'].items():
-                    if isinstance(info, dict) and 'score' in info:
-                        scores[dim] = info['score']
+                scores = {dim: info['score']
+                          for dim, info in turn_data['scores'].items()
+                          if isinstance(info, dict) and 'score' in info}
                 if scores:
                     turns[int(turn_key)] = scores
         return turns
@@ -206,7 +265,7 @@ def figure_calibration_variance(rows):
             sd = np.std(list(dim_scores.values()))
             data[(model, condition, arch)].append(sd)
 
-    fig, axes = plt.subplots(1, 2, figsize=(12, 5), sharey=True)
+    fig, axes = new_figure(1, 2, figsize=(12, 5), sharey=True)
 
     for idx, model in enumerate(['DeepSeek', 'Haiku']):
         ax = axes[idx]
@@ -244,7 +303,7 @@ def figure_calibration_variance(rows):
                 ax.text(0.95, 0.95, f'Calibration\nd = {d:.2f}',
                         transform=ax.transAxes, ha='right', va='top',
                         fontsize=11, fontweight='bold', color=DARK_GREEN,
-                        bbox=dict(boxstyle='round,pad=0.3', facecolor='#e8f5e9', alpha=0.8))
+                        bbox=dict(boxstyle=NOTE_BOX, facecolor='#e8f5e9', alpha=0.8))
 
     fig.suptitle('Within-Response Dimension Variance by Condition',
                  fontsize=14, fontweight='bold', y=1.02)
@@ -253,11 +312,8 @@ def figure_calibration_variance(rows):
              'Hatched bars = multi-agent architecture.',
              ha='center', fontsize=9, color='gray', style='italic')
 
-    plt.tight_layout()
-    path = os.path.join(FIGURES_DIR, 'figure-calibration-variance.png')
-    plt.savefig(path, bbox_inches='tight')
-    plt.close()
-    print(f'  -> {path}')
+    fig.tight_layout()
+    save(fig, figure_calibration_variance)
 
 
 # ── Figure 2: Dimension-Specific Floor Lifting (§6.1.2) ─────────────────────
@@ -280,7 +336,7 @@ def figure_dimension_lifting(rows):
             for dim, score in per_turn[0].items():
                 dim_data[(model, condition)][dim].append(score)
 
-    fig, axes = plt.subplots(1, 2, figsize=(14, 6), sharey=True)
+    fig, axes = new_figure(1, 2, figsize=(14, 6), sharey=True)
 
     for idx, model in enumerate(['DeepSeek', 'Haiku']):
         ax = axes[idx]
@@ -317,11 +373,8 @@ def figure_dimension_lifting(rows):
              'Strongest baseline dimensions (right) show smallest lift.',
              ha='center', fontsize=9, color='gray', style='italic')
 
-    plt.tight_layout()
-    path = os.path.join(FIGURES_DIR, 'figure-dimension-lifting.png')
-    plt.savefig(path, bbox_inches='tight')
-    plt.close()
-    print(f'  -> {path}')
+    fig.tight_layout()
+    save(fig, figure_dimension_lifting)
 
 
 # ── Figure 3: Architecture Interaction — The Substitution Pattern (§6.1.3) ──
@@ -336,20 +389,19 @@ def figure_architecture_interaction(rows):
         score = row['tutor_overall_score'] if row['tutor_overall_score'] is not None else row['tutor_first_turn_score']
         data[(model, condition, arch)].append(score)
 
-    fig, axes = plt.subplots(1, 2, figsize=(12, 5.5), sharey=False)
-
-    for idx, model in enumerate(['DeepSeek', 'Haiku']):
-        ax = axes[idx]
+    fig, axes = new_figure(1, 2, figsize=(12, 5.5), sharey=False)
 
-        # Means for the 2x2
-        bs = np.mean(data[(model, 'base', 'single')])
-        bm = np.mean(data[(model, 'base', 'multi')])
-        rs = np.mean(data[(model, 'recog', 'single')])
-        rm = np.mean(data[(model, 'recog', 'multi')])
+    # 2x2 cell means for every model as one (model, condition, arch) array, so
+    # the architecture deltas are a single array difference
+    models = ['DeepSeek', 'Haiku']
+    means = np.array([[[np.mean(data[(model, condition, arch)]) for arch in ('single', 'multi')]
+                       for condition in ('base', 'recog')] for model in models])
+    arch_deltas = means[..., 1] - means[..., 0]
 
-        # Architecture delta labels
-        base_delta = bm - bs
-        recog_delta = rm - rs
+    for idx, model in enumerate(models):
+        ax = axes[idx]
+        (bs, bm), (rs, rm) = means[idx]
+        base_delta, recog_delta = arch_deltas[idx]
 
         # Interaction plot (lines connecting single to multi)
         ax.plot([0, 1], [bs, bm], 'o-', color=BASE_COLOR, linewidth=2.5,
@@ -372,11 +424,11 @@ def figure_architecture_interaction(rows):
         ax.annotate(f'$\\Delta$ = {base_delta:+.1f}',
                    xy=(0.5, mid_y_base), fontsize=11, color='#555',
                    ha='center', fontweight='bold',
-                   bbox=dict(boxstyle='round,pad=0.2', facecolor='white', alpha=0.8))
+                   bbox=dict(boxstyle=LABEL_BOX, facecolor='white', alpha=0.8))
         ax.annotate(f'$\\Delta$ = {recog_delta:+.1f}',
                    xy=(0.5, mid_y_recog), fontsize=11, color=DARK_GREEN,
                    ha='center', fontweight='bold',
-                   bbox=dict(boxstyle='round,pad=0.2', facecolor='#e8f5e9', alpha=0.8))
+                   bbox=dict(boxstyle=LABEL_BOX, facecolor='#e8f5e9', alpha=0.8))
 
         ax.set_xticks([0, 1])
         ax.set_xticklabels(['Single-Agent', 'Multi-Agent'], fontsize=11)
@@ -392,11 +444,8 @@ def figure_architecture_interaction(rows):
              'Under recognition, the benefit collapses to near-zero in both models.',
              ha='center', fontsize=9, color='gray', style='italic')
 
-    plt.tight_layout()
-    path = os.path.join(FIGURES_DIR, 'figure-architecture-interaction.png')
-    plt.savefig(path, bbox_inches='tight')
-    plt.close()
-    print(f'  -> {path}')
+    fig.tight_layout()
+    save(fig, figure_architecture_interaction)
 
 
 # ── Figure 4: Error Correction — Approval Rates and Critique Shift (§6.2) ──
@@ -414,7 +463,7 @@ def figure_error_correction(rows):
     base_delib = [45.7, 51.5]
     recog_delib = [27.2, 45.9]
 
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+    fig, (ax1, ax2) = new_figure(1, 2, figsize=(12, 5))
 
     # Panel A: Approval rates
     x = np.arange(len(models))
@@ -425,10 +474,11 @@ def figure_error_correction(rows):
     bars_recog = ax1.bar(x + width/2, recog_approval, width, label='Recognition',
                          color=RECOG_COLOR, edgecolor='white')
 
+    # annotation_clip=False keeps a label drawn, as ax.text did, if its bar
+    # ends above the fixed ylim below
     for bars, vals in [(bars_base, base_approval), (bars_recog, recog_approval)]:
-        for bar, val in zip(bars, vals):
-            ax1.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 1,
-                    f'{val}%', ha='center', va='bottom', fontsize=10, fontweight='bold')
+        ax1.bar_label(bars, labels=[f'{v}%' for v in vals], padding=3,
+                      fontsize=10, fontweight='bold', annotation_clip=False)
 
     # Add shift arrows
     for i in range(len(models)):
@@ -450,10 +500,9 @@ def figure_error_correction(rows):
     bars_recog2 = ax2.bar(x + width/2, recog_delib, width, label='Recognition',
                           color=RECOG_COLOR, edgecolor='white')
 
-    for bars, vals in [(bars_base2, base_delib), (bars_recog2, recog_delib)]:
-        for bar, val in zip(bars, vals):
-            ax2.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 1,
-                    f'{val:.1f}', ha='center', va='bottom', fontsize=10, fontweight='bold')
+    for bars in (bars_base2, bars_recog2):
+        ax2.bar_label(bars, fmt='{:.1f}', padding=3, fontsize=10, fontweight='bold',
+                      annotation_clip=False)
 
     # Add delta annotations
     for i in range(len(models)):
@@ -476,11 +525,8 @@ def figure_error_correction(rows):
              'and deliberation becomes perfunctory (b).',
              ha='center', fontsize=9, color='gray', style='italic')
 
-    plt.tight_layout()
-    path = os.path.join(FIGURES_DIR, 'figure-error-correction.png')
-    plt.savefig(path, bbox_inches='tight')
-    plt.close()
-    print(f'  -> {path}')
+    fig.tight_layout()
+    save(fig, figure_error_correction)
 
 
 # ── Figure 5: Trajectory Curves (§6.3.2) ────────────────────────────────────
@@ -502,7 +548,7 @@ def figure_trajectory_curves(rows):
         for turn, score in learner_turns.items():
             learner_trajectories[condition][turn].append(score)
 
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(13, 5.5), sharey=True)
+    fig, (ax1, ax2) = new_figure(1, 2, figsize=(13, 5.5), sharey=True)
 
     # Panel A: Tutor trajectories
     for condition, color, label in [('recog', RECOG_COLOR, 'Recognition'),
@@ -551,11 +597,8 @@ def figure_trajectory_curves(rows):
              'Learner trajectories converge regardless of tutor condition.',
              ha='center', fontsize=9, color='gray', style='italic')
 
-    plt.tight_layout()
-    path = os.path.join(FIGURES_DIR, 'figure-trajectory-curves.png')
-    plt.savefig(path, bbox_inches='tight')
-    plt.close()
-    print(f'  -> {path}')
+    fig.tight_layout()
+    save(fig, figure_trajectory_curves)
 
 
 # ── Figure 6: Tutor-Learner Asymmetry (§6.5.1) ─────────────────────────────
@@ -573,7 +616,7 @@ def figure_tutor_learner_asymmetry(rows):
         if row['dialogue_quality_score'] is not None:
             data[(model, condition)]['dialogue'].append(row['dialogue_quality_score'])
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = new_figure(figsize=(10, 6))
 
     models = ['DeepSeek', 'Haiku']
     measures = ['Tutor', 'Learner', 'Dialogue']
@@ -597,9 +640,7 @@ def figure_tutor_learner_asymmetry(rows):
         bars = ax.bar(x + offset, effect_sizes, width, label=model,
                       color=color, edgecolor='white', linewidth=0.5)
 
-        for bar, d_val in zip(bars, effect_sizes):
-            ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.03,
-                    f'd={d_val:.2f}', ha='center', va='bottom', fontsize=10, fontweight='bold')
+        ax.bar_label(bars, fmt='d={:.2f}', padding=2, fontsize=10, fontweight='bold')
 
     # Reference lines
     ax.axhline(y=0.8, color='gray', linestyle='--', linewidth=0.7, alpha=0.5)
@@ -621,11 +662,8 @@ def figure_tutor_learner_asymmetry(rows):
              'Dialogue quality tracks tutor quality.',
              ha='center', fontsize=9, color='gray', style='italic')
 
-    plt.tight_layout()
-    path = os.path.join(FIGURES_DIR, 'figure-tutor-learner-asymmetry.png')
-    plt.savefig(path, bbox_inches='tight')
-    plt.close()
-    print(f'  -> {path}')
+    fig.tight_layout()
+    save(fig, figure_tutor_learner_asymmetry)
 
 
 # ── Figure 7: Cross-Model Mechanism Replication (§6.6) ──────────────────────
@@ -645,7 +683,7 @@ def figure_cross_model_replication(rows):
     deepseek_vals = [1.88, 0.2, 0.52, 41.8, 7.5]
     haiku_vals = [1.84, -0.7, 0.64, 14.5, 11.5]
 
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax = new_figure(figsize=(12, 6))
     x = np.arange(len(indicators))
     width = 0.3
 
@@ -654,13 +692,10 @@ def figure_cross_model_replication(rows):
     bars2 = ax.bar(x + width/2, haiku_vals, width, label='Haiku 4.5',
                    color=HAIKU_COLOR, edgecolor='white')
 
+    # bar_label puts each label above a positive bar and below a negative one
     for bars, vals in [(bars1, deepseek_vals), (bars2, haiku_vals)]:
-        for bar, val in zip(bars, vals):
-            y_pos = max(bar.get_height() + 0.3, 0.3) if val >= 0 else val - 0.5
-            va = 'bottom' if val >= 0 else 'top'
-            ax.text(bar.get_x() + bar.get_width()/2, y_pos,
-                    f'{val:.1f}' if val != int(val) else f'{val:.0f}',
-                    ha='center', va=va, fontsize=9, fontweight='bold')
+        ax.bar_label(bars, labels=[f'{val:.1f}' if val != int(val) else f'{val:.0f}' for val in vals],
+                     padding=3, fontsize=9, fontweight='bold')
 
     # Visual grouping: replicates vs model-dependent
     ax.axvspan(-0.5, 2.5, alpha=0.05, color='green')
@@ -682,11 +717,8 @@ def figure_cross_model_replication(rows):
              'Direction replicates across models; magnitude varies with model capability.',
              ha='center', fontsize=9, color='gray', style='italic')
 
-    plt.tight_layout()
-    path = os.path.join(FIGURES_DIR, 'figure-cross-model-replication.png')
-    plt.savefig(path, bbox_inches='tight')
-    plt.close()
-    print(f'  -> {path}')
+    fig.tight_layout()
+    save(fig, figure_cross_model_replication)
 
 
 # ── Figure 8: Unified Variance Reduction Pattern (§6.4.4) ───────────────────
@@ -707,7 +739,7 @@ def figure_variance_reduction(rows):
     indicators = ['Within-Response\nDim SD', 'Tutor Score SD']
     models = ['DeepSeek', 'Haiku']
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = new_figure(figsize=(10, 6))
 
     x = np.arange(len(indicators))
     bar_width = 0.18
@@ -731,10 +763,8 @@ def figure_variance_reduction(rows):
                          edgecolor='gray', linewidth=0.5, hatch=hatch,
                          label=f'{" / ".join(label_parts)}')
 
-            for bar, val in zip(bars, vals):
-                ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.15,
-                        f'{val:.2f}' if val < 1 else f'{val:.1f}',
-                        ha='center', va='bottom', fontsize=8, rotation=0)
+            ax.bar_label(bars, labels=[f'{v:.2f}' if v < 1 else f'{v:.1f}' for v in vals],
+                         padding=2, fontsize=8)
 
     ax.set_xticks(x)
     ax.set_xticklabels(indicators, fontsize=11)
@@ -747,11 +777,8 @@ def figure_variance_reduction(rows):
              'Recognition narrows the output distribution across multiple measures simultaneously.',
              ha='center', fontsize=9, color='gray', style='italic')
 
-    plt.tight_layout()
-    path = os.path.join(FIGURES_DIR, 'figure-variance-reduction.png')
-    plt.savefig(path, bbox_inches='tight')
-    plt.close()
-    print(f'  -> {path}')
+    fig.tight_layout()
+    save(fig, figure_variance_reduction)
 
 
 # ── Figure 9: Development Trajectories (§6.3.1) ────────────────────────────
@@ -767,7 +794,7 @@ def figure_development_trajectories(rows):
             dev = last - first
             data[(model, condition, arch)].append(dev)
 
-    fig, axes = plt.subplots(1, 2, figsize=(13, 5.5))
+    fig, axes = new_figure(1, 2, figsize=(13, 5.5))
 
     for idx, model in enumerate(['DeepSeek', 'Haiku']):
         ax = axes[idx]
@@ -811,11 +838,8 @@ def figure_development_trajectories(rows):
              'Hatched = multi-agent.',
              ha='center', fontsize=9, color='gray', style='italic')
 
-    plt.tight_layout()
-    path = os.path.join(FIGURES_DIR, 'figure-development-trajectories.png')
-    plt.savefig(path, bbox_inches='tight')
-    plt.close()
-    print(f'  -> {path}')
+    fig.tight_layout()
+    save(fig, figure_development_trajectories)
 
 
 # ── Figure 10: Scenario-Dependent Calibration (§6.1.4) ─────────────────────
@@ -831,7 +855,7 @@ def figure_scenario_effects(rows):
             score = row['tutor_overall_score'] if row['tutor_overall_score'] is not None else row['tutor_first_turn_score']
             scenario_data[(model, scenario, condition)]['tutor'].append(score)
 
-    fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+    fig, axes = new_figure(1, 2, figsize=(14, 6))
 
     for idx, model in enumerate(['DeepSeek', 'Haiku']):
         ax = axes[idx]
@@ -882,9 +906,8 @@ def figure_scenario_effects(rows):
         y = np.arange(len(labels))
         bars = ax.barh(y, deltas, color=colors, edgecolor='white', linewidth=0.5)
 
-        for bar, delta, n in zip(bars, deltas, ns):
-            ax.text(bar.get_width() + 0.5, bar.get_y() + bar.get_height()/2,
-                    f'+{delta:.1f} (N={n})', ha='left', va='center', fontsize=8)
+        ax.bar_label(bars, labels=[f'+{delta:.1f} (N={n})' for delta, n in zip(deltas, ns)],
+                     padding=3, fontsize=8)
 
         ax.set_yticks(y)
         ax.set_yticklabels(labels, fontsize=8)
@@ -902,11 +925,8 @@ def figure_scenario_effects(rows):
     fig.suptitle('Scenario-Dependent Calibration: Impasse Scenarios Show Largest Effects',
                  fontsize=14, fontweight='bold', y=1.02)
 
-    plt.tight_layout()
-    path = os.path.join(FIGURES_DIR, 'figure-scenario-effects.png')
-    plt.savefig(path, bbox_inches='tight')
-    plt.close()
-    print(f'  -> {path}')
+    fig.tight_layout()
+    save(fig, figure_scenario_effects)
 
 
 GEMINI_COLOR = '#e91e63'     # Pink for Gemini Flash
@@ -951,7 +971,7 @@ def figure_adaptation_faceted(all_rows):
     ncols = 4
     nrows = (n_dims + ncols - 1) // ncols
 
-    fig, axes = plt.subplots(nrows, ncols, figsize=(16, 4 * nrows), sharey=True)
+    fig, axes = new_figure(nrows, ncols, figsize=(16, 4 * nrows), sharey=True)
     axes_flat = axes.flatten() if n_dims > 1 else [axes]
 
     for i, dim in enumerate(dims):
@@ -989,11 +1009,8 @@ def figure_adaptation_faceted(all_rows):
              'Ribbons = 95% CI.',
              ha='center', fontsize=9, color='gray', style='italic')
 
-    plt.tight_layout()
-    path = os.path.join(FIGURES_DIR, 'figure-adaptation-faceted.png')
-    plt.savefig(path, bbox_inches='tight')
-    plt.close()
-    print(f'  -> {path}')
+    fig.tight_layout()
+    save(fig, figure_adaptation_faceted)
 
 
 # ── Figure 12: Scissors Plot — Tutor vs Learner Trajectories (§6.3/§6.5) ────
@@ -1015,7 +1032,7 @@ def figure_scissors_plot(all_rows):
         for turn, score in learner_turns.items():
             trajectories[('learner', condition)][turn].append(score)
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = new_figure(figsize=(10, 6))
 
     line_specs = [
         (('tutor', 'recog'), RECOG_COLOR, '-', 'o', 'Tutor + Recognition'),
@@ -1049,11 +1066,8 @@ def figure_scissors_plot(all_rows):
              'Learner trajectories are recognition-invariant (d < 0.1).',
              ha='center', fontsize=9, color='gray', style='italic')
 
-    plt.tight_layout()
-    path = os.path.join(FIGURES_DIR, 'figure-scissors-plot.png')
-    plt.savefig(path, bbox_inches='tight')
-    plt.close()
-    print(f'  -> {path}')
+    fig.tight_layout()
+    save(fig, figure_scissors_plot)
 
 
 # ── Figure 13: Conditional Development Boxplots (§6.3) ──────────────────────
@@ -1070,7 +1084,7 @@ def figure_conditional_boxplots(all_rows):
             dev = last - first
             data[(condition, learner)].append(dev)
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = new_figure(figsize=(10, 6))
 
     groups = [
         ('base', 'unified', 'Base\nUnified'),
@@ -1097,18 +1111,21 @@ def figure_conditional_boxplots(all_rows):
         patch.set_facecolor(color)
         patch.set_alpha(alpha)
 
-    for i, (vals, color) in enumerate(zip(box_data, colors)):
-        jitter = np.random.normal(0, 0.08, len(vals))
-        ax.scatter([i + j for j in jitter], vals, color=color,
-                   alpha=0.4, s=20, zorder=3, edgecolors='none')
+    # Every group's jittered points go into one PathCollection, colored per point
+    counts = [len(vals) for vals in box_data]
+    jitter = np.random.normal(0, 0.08, sum(counts))
+    ax.scatter(np.repeat(positions, counts) + jitter, np.concatenate(box_data),
+               color=np.repeat(colors, counts), alpha=0.4, s=20, zorder=3, edgecolors='none')
 
-    # N and mean annotations inside each box
+    # N and mean annotations inside each box. The label backgrounds stay as
+    # per-Text bboxes: they size to each label's rendered extent, which a
+    # PatchCollection built up front cannot know
     for i, vals in enumerate(box_data):
         mean_val = np.mean(vals)
         median_val = np.median(vals)
         ax.text(i, median_val + 3, f'N={len(vals)}',
                 ha='center', va='bottom', fontsize=8, fontweight='bold',
-                bbox=dict(boxstyle='round,pad=0.2', facecolor='white', alpha=0.8))
+                bbox=dict(boxstyle=LABEL_BOX, facecolor='white', alpha=0.8))
 
     ax.axhline(y=0, color='black', linewidth=1, linestyle='-', alpha=0.5)
     ax.set_xticks(positions)
@@ -1131,24 +1148,70 @@ def figure_conditional_boxplots(all_rows):
              'Light = unified; solid = ego-superego. Diamond = mean.',
              ha='center', fontsize=9, color='gray', style='italic')
 
-    plt.tight_layout()
-    path = os.path.join(FIGURES_DIR, 'figure-conditional-boxplots.png')
-    plt.savefig(path, bbox_inches='tight')
-    plt.close()
-    print(f'  -> {path}')
+    fig.tight_layout()
+    save(fig, figure_conditional_boxplots)
 
 
 # ── Main ─────────────────────────────────────────────────────────────────────
 
+FACTORIAL_FIGURES = (
+    figure_calibration_variance,
+    figure_dimension_lifting,
+    figure_architecture_interaction,
+    figure_error_correction,
+    figure_trajectory_curves,
+    figure_tutor_learner_asymmetry,
+    figure_cross_model_replication,
+    figure_variance_reduction,
+    figure_development_trajectories,
+    figure_scenario_effects,
+)
+
+ALL_MODELS_FIGURES = (
+    figure_adaptation_faceted,
+    figure_scissors_plot,
+    figure_conditional_boxplots,
+)
+
+_WORKER_DATA = {}
+
+
+def _init_worker(rows, all_rows):
+    """Pool initializer: keep both datasets in the worker for _render."""
+    _WORKER_DATA['rows'] = rows
+    _WORKER_DATA['all_rows'] = all_rows
+
+
+def _render(fn, dataset):
+    """Pool task: draw figure function ``fn`` from the worker's ``dataset``."""
+    fn(_WORKER_DATA[dataset])
+
+
 def main():
+    parser = argparse.ArgumentParser(description='Generate the Paper 2.0 figures.')
+    parser.add_argument('--force', action='store_true',
+                        help='rebuild every figure even if its PNG is up to date')
+    args = parser.parse_args()
+
     os.makedirs(FIGURES_DIR, exist_ok=True)
 
     if not os.path.exists(DB_PATH):
         print(f'ERROR: Database not found at {DB_PATH}')
         sys.exit(1)
 
+    key = render_key()
+    # Module-level figure functions pickle by reference, so the pool is handed
+    # the functions themselves
+    jobs = [(fn, 'rows') for fn in FACTORIAL_FIGURES]
+    jobs += [(fn, 'all_rows') for fn in ALL_MODELS_FIGURES]
+    n_figures = len(jobs)
+    jobs = [job for job in jobs if args.force or not is_current(job[0], key)]
+    if not jobs:
+        print(f'Up to date: all {n_figures} figures in {FIGURES_DIR}/')
+        return
+
     print('Loading evaluation data...')
-    rows = load_factorial_data()
+    rows, all_rows = load_evaluation_data()
     print(f'  Loaded {len(rows)} rows from cells 80-87 (DeepSeek + Haiku, v2.2)')
 
     # Classify and summarize
@@ -1160,29 +1223,21 @@ def main():
     for (model, cond, arch), n in sorted(summary.items()):
         print(f'    {model} / {cond} / {arch}: N={n}')
 
+    # New WS1 figures: all 3 models for pooled trajectory analysis
+    print(f'\n  Loaded {len(all_rows)} rows from cells 80-87 (3 models, Sonnet judge, v2.2)')
+
     print(f'\nGenerating Paper 2.0 figures to {FIGURES_DIR}/\n')
 
-    figure_calibration_variance(rows)
-    figure_dimension_lifting(rows)
-    figure_architecture_interaction(rows)
-    figure_error_correction(rows)
-    figure_trajectory_curves(rows)
-    figure_tutor_learner_asymmetry(rows)
-    figure_cross_model_replication(rows)
-    figure_variance_reduction(rows)
-    figure_development_trajectories(rows)
-    figure_scenario_effects(rows)
-
-    # New WS1 figures: load all 3 models for pooled trajectory analysis
-    print('\nLoading all-models data (DeepSeek + Haiku + Gemini Flash)...')
-    all_rows = load_all_models_data()
-    print(f'  Loaded {len(all_rows)} rows from cells 80-87 (3 models, Sonnet judge, v2.2)')
-
-    figure_adaptation_faceted(all_rows)
-    figure_scissors_plot(all_rows)
-    figure_conditional_boxplots(all_rows)
-
-    print(f'\nDone. 13 figures generated in {FIGURES_DIR}/')
+    # The figures are independent and each is bound by single-threaded Agg
+    # rendering, so spread them over processes. Rows are handed to each
+    # worker once (as plain dicts, since sqlite3.Row does not pickle) rather
+    # than with every task.
+    with ProcessPoolExecutor(
+            initializer=_init_worker,
+            initargs=([dict(r) for r in rows], [dict(r) for r in all_rows])) as ex:
+        list(ex.map(_render, *zip(*jobs)))
+
+    print(f'\nDone. {len(jobs)} of {n_figures} figures generated in {FIGURES_DIR}/')
 
     print('\n--- Figure Plan Summary ---')
     print('''
@@ -6,24 +6,36 @@ Rule-based qualitative coding of tutor responses from cells 80-87 (messages mode
 comparing base (cells 80-83) vs recognition (cells 84-87) conditions.
 
 Outputs: docs/research/figures/figure-qualitative-tags.png
+
+Run: python3 scripts/generate-qualitative-tags-figure.py
+Release build: FIG_PNG_COMPRESS=9 python3 scripts/generate-qualitative-tags-figure.py
+Re-render even if current: python3 scripts/generate-qualitative-tags-figure.py --force
+
+The PNG records a hash of this script, the database mtime, DPI and PNG
+compression; when none of those have changed the render is skipped before
+matplotlib is even imported.
 """
 
+import argparse
+import hashlib
 import json
 import os
 import re
 import sqlite3
 import sys
+from collections import Counter
 
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import matplotlib.ticker as mticker
-import numpy as np
+from PIL import Image
 
 # --- Configuration ---
 
 DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'evaluations.db')
 OUTPUT_PATH = os.path.join(os.path.dirname(__file__), '..', 'docs', 'research', 'figures', 'figure-qualitative-tags.png')
+DPI = 300
+# zlib level for the PNG encoder; 1 is several times faster than the default 6
+PNG_COMPRESS = int(os.environ.get('FIG_PNG_COMPRESS', '1'))
+# Shared by every bar's value label; only the position and alignment vary
+VALUE_LABEL_KW = dict(va='center', fontsize=9, fontweight='bold', color='#333333')
 
 BASE_CELLS = [
     'cell_80_messages_base_single_unified',
@@ -190,78 +202,153 @@ def extract_messages(suggestions_json):
         for s in suggestions:
             if isinstance(s, dict):
                 msg = s.get('message', '')
-                if msg:
+                if msg and isinstance(msg, str):
                     messages.append(msg)
     return messages
 
 
-def code_text(text, tag_patterns):
-    """Return set of tags that match in the given text."""
-    tags_found = set()
+def load_responses(conn, cells):
+    """
+    Return one combined text per evaluation row for the given cells, joining
+    all of the row's suggestion messages. Rows without messages are dropped.
+    """
+    placeholders = ','.join(['?'] * len(cells))
+    # JSON1 flattens suggestions[].message and re-joins per row in SQLite;
+    # malformed or non-array payloads become '[]' and contribute nothing, and
+    # non-object elements reach the path functions as NULL, since a bare
+    # string element is not valid JSON and would fail the whole query. The
+    # inner select is ordered so each row's messages join in array order, as
+    # extract_messages joins them: the tag patterns run on the joined text
+    try:
+        return [text for (text,) in conn.execute(
+            f"""
+            SELECT group_concat(msg, ' ') FROM (
+                SELECT r.id AS id,
+                       json_extract(CASE WHEN s.type = 'object' THEN s.value END, '$.message') AS msg
+                FROM evaluation_results r,
+                     json_each(CASE WHEN json_valid(r.suggestions) AND json_type(r.suggestions) = 'array'
+                                    THEN r.suggestions ELSE '[]' END) AS s
+                WHERE r.profile_name IN ({placeholders})
+                  AND json_type(CASE WHEN s.type = 'object' THEN s.value END, '$.message') = 'text'
+                  AND json_extract(CASE WHEN s.type = 'object' THEN s.value END, '$.message') != ''
+                ORDER BY r.id, s.key
+            )
+            GROUP BY id
+            """,
+            cells,
+        )]
+    except sqlite3.OperationalError:
+        # SQLite built without JSON1 (no json_each): parse in Python
+        rows = conn.execute(
+            f"SELECT suggestions FROM evaluation_results WHERE profile_name IN ({placeholders})",
+            cells,
+        )
+        return [' '.join(messages) for (suggestions_json,) in rows
+                if (messages := extract_messages(suggestions_json))]
+
+
+def compile_tag_patterns(tag_patterns):
+    """Compile each tag's patterns into one alternation, matched if ANY pattern is."""
+    return {
+        tag: re.compile('|'.join(f'(?:{p})' for p in patterns))
+        for tag, patterns in tag_patterns.items()
+    }
+
+
+def code_text(text, tag_regexes):
+    """Return set of tags whose compiled pattern matches in the given text."""
     text_lower = text.lower() if text else ''
-    for tag, patterns in tag_patterns.items():
-        for pattern in patterns:
-            if re.search(pattern, text_lower):
-                tags_found.add(tag)
-                break
-    return tags_found
+    return {tag for tag, regex in tag_regexes.items() if regex.search(text_lower)}
 
 
-def compute_tag_frequencies(rows, tag_patterns):
+def compute_tag_frequencies(responses, tag_patterns):
     """
     Compute tag frequency as proportion of responses containing each tag.
+    Each response is ALL messages of a row combined (see load_responses).
     Returns (tag_counts, total_responses).
     """
-    tag_counts = {tag: 0 for tag in tag_patterns}
-    total_responses = 0
-
-    for (suggestions_json,) in rows:
-        messages = extract_messages(suggestions_json)
-        if not messages:
-            continue
-        # Treat ALL messages in a row as one combined response for coding
-        combined_text = ' '.join(messages)
-        total_responses += 1
-        tags = code_text(combined_text, tag_patterns)
-        for tag in tags:
-            tag_counts[tag] += 1
-
-    return tag_counts, total_responses
+    tag_counts = Counter({tag: 0 for tag in tag_patterns})
+    tag_regexes = compile_tag_patterns(tag_patterns)
+
+    for combined_text in responses:
+        tag_counts.update(code_text(combined_text, tag_regexes))
+
+    return tag_counts, len(responses)
+
+
+def value_label_anchor(val):
+    """Return (x, ha) for the value label of a divergence bar of width ``val``."""
+    if abs(val) < 0.1:
+        # Near-zero: place label to the right of zero
+        return 0.3, 'left'
+    if val >= 0:
+        # Positive bars: label to the right of the bar end
+        return val + 0.3, 'left'
+    if abs(val) < 7:
+        # Small negative bars: label to the right of zero to avoid
+        # collision with the y-axis tick label
+        return 0.3, 'left'
+    # Large negative bars: label to the left of the bar end
+    return val - 0.3, 'right'
+
+
+def render_key(db_path):
+    """Hash of everything the output PNG depends on."""
+    h = hashlib.blake2b(digest_size=8)
+    with open(__file__, 'rb') as f:
+        h.update(f.read())
+    h.update(repr((os.path.getmtime(db_path), DPI, PNG_COMPRESS)).encode())
+    return h.hexdigest()
+
+
+def is_current(path, key):
+    """True if ``path`` was rendered from the inputs hashed in ``key``."""
+    try:
+        with Image.open(path) as im:
+            return im.text.get('Source-Hash') == key
+    except OSError:
+        return False
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Generate the qualitative tag divergence figure.')
+    parser.add_argument('--force', action='store_true',
+                        help='regenerate even if the PNG is up to date')
+    args = parser.parse_args()
+
     # Connect to database
     db_path = os.path.abspath(DB_PATH)
     if not os.path.exists(db_path):
         print(f"Error: Database not found at {db_path}", file=sys.stderr)
         sys.exit(1)
 
-    conn = sqlite3.connect(db_path)
+    output_path = os.path.abspath(OUTPUT_PATH)
+    key = render_key(db_path)
+    if not args.force and is_current(output_path, key):
+        print(f"Up to date: {output_path}")
+        return
 
-    # Query base condition (cells 80-83)
-    placeholders = ','.join(['?'] * len(BASE_CELLS))
-    base_rows = conn.execute(
-        f"SELECT suggestions FROM evaluation_results WHERE profile_name IN ({placeholders})",
-        BASE_CELLS,
-    ).fetchall()
+    # Plotting libraries are imported only once a render is needed, so an
+    # up-to-date run exits without paying for matplotlib and numpy
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import matplotlib.ticker as mticker
+    import numpy as np
 
-    # Query recognition condition (cells 84-87)
-    placeholders = ','.join(['?'] * len(RECOG_CELLS))
-    recog_rows = conn.execute(
-        f"SELECT suggestions FROM evaluation_results WHERE profile_name IN ({placeholders})",
-        RECOG_CELLS,
-    ).fetchall()
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
 
-    conn.close()
+    # Base condition (cells 80-83) and recognition condition (cells 84-87)
+    base_responses = load_responses(conn, BASE_CELLS)
+    recog_responses = load_responses(conn, RECOG_CELLS)
 
-    print(f"Base condition: {len(base_rows)} rows")
-    print(f"Recognition condition: {len(recog_rows)} rows")
+    conn.close()
 
     # Compute tag frequencies
-    base_counts, base_total = compute_tag_frequencies(base_rows, TAG_PATTERNS)
-    recog_counts, recog_total = compute_tag_frequencies(recog_rows, TAG_PATTERNS)
+    base_counts, base_total = compute_tag_frequencies(base_responses, TAG_PATTERNS)
+    recog_counts, recog_total = compute_tag_frequencies(recog_responses, TAG_PATTERNS)
 
-    print(f"\nBase responses coded: {base_total}")
+    print(f"Base responses coded: {base_total}")
     print(f"Recognition responses coded: {recog_total}")
 
     if base_total == 0 or recog_total == 0:
@@ -280,12 +367,12 @@ def main():
     for tag in sorted(tags, key=lambda t: divergence[t], reverse=True):
         print(f"{TAG_LABELS[tag]:<28} {base_props[tag]:>7.1f}% {recog_props[tag]:>7.1f}% {divergence[tag]:>+7.1f}%")
 
-    # Sort by absolute divergence magnitude
-    sorted_tags = sorted(tags, key=lambda t: abs(divergence[t]))
+    # Sort by absolute divergence magnitude, carrying each value with its tag
+    ranked = sorted(divergence.items(), key=lambda item: abs(item[1]))
 
-    labels = [TAG_LABELS[t] for t in sorted_tags]
-    values = [divergence[t] for t in sorted_tags]
-    colors = ['#2ca02c' if v >= 0 else '#d62728' for v in values]
+    labels = [TAG_LABELS[t] for t, _ in ranked]
+    values = [v for _, v in ranked]
+    colors = np.where(np.asarray(values) >= 0, '#2ca02c', '#d62728').tolist()
 
     # --- Generate Figure ---
     fig, ax = plt.subplots(figsize=(10, 6.5))
@@ -307,35 +394,9 @@ def main():
     ax.axvline(x=0, color='black', linewidth=0.8, linestyle='-')
 
     # Add value labels on bars
-    for bar, val in zip(bars, values):
-        x_pos = bar.get_width()
-        if abs(val) < 0.1:
-            # Near-zero: place label to the right of zero
-            ha = 'left'
-            text_x = 0.3
-        elif x_pos >= 0:
-            # Positive bars: label to the right of the bar end
-            ha = 'left'
-            text_x = x_pos + 0.3
-        elif abs(x_pos) < 7:
-            # Small negative bars: label to the right of zero to avoid
-            # collision with the y-axis tick label
-            ha = 'left'
-            text_x = 0.3
-        else:
-            # Large negative bars: label to the left of the bar end
-            ha = 'right'
-            text_x = x_pos - 0.3
-        ax.text(
-            text_x,
-            bar.get_y() + bar.get_height() / 2,
-            f'{val:+.1f}%',
-            va='center',
-            ha=ha,
-            fontsize=9,
-            fontweight='bold',
-            color='#333333',
-        )
+    label_specs = [(*value_label_anchor(val), f'{val:+.1f}%') for val in values]
+    for bar, (text_x, ha, text) in zip(bars, label_specs):
+        ax.text(text_x, bar.get_y() + bar.get_height() / 2, text, ha=ha, **VALUE_LABEL_KW)
 
     # Add condition summary annotation
     ax.annotate(
@@ -374,7 +435,8 @@ def main():
     # Ensure output directory exists
     os.makedirs(os.path.dirname(os.path.abspath(OUTPUT_PATH)), exist_ok=True)
 
-    fig.savefig(os.path.abspath(OUTPUT_PATH), dpi=300, bbox_inches='tight', facecolor='white')
+    fig.savefig(os.path.abspath(OUTPUT_PATH), dpi=DPI, bbox_inches='tight', facecolor='white',
+                metadata={'Source-Hash': key}, pil_kwargs={'compress_level': PNG_COMPRESS})
     print(f"\nFigure saved to: {os.path.abspath(OUTPUT_PATH)}")
     plt.close(fig)
 
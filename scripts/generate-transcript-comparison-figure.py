@@ -9,14 +9,25 @@ two-column panel figure showing the qualitative difference.
 Output: docs/research/figures/figure-transcript-comparison.png
 
 Run: python3 scripts/generate-transcript-comparison-figure.py
+Draft render: FIG_DPI=150 python3 scripts/generate-transcript-comparison-figure.py
+Release build: FIG_PNG_COMPRESS=9 python3 scripts/generate-transcript-comparison-figure.py
+Re-render even if current: python3 scripts/generate-transcript-comparison-figure.py --force
+
+The PNG records a hash of this script, the database mtime, DPI and PNG
+compression; when none of those have changed the render is skipped.
 """
 
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from matplotlib.patches import FancyBboxPatch
+from matplotlib.collections import PatchCollection
+from matplotlib.font_manager import FontProperties
+from matplotlib.patches import BoxStyle, FancyBboxPatch
+from PIL import Image
 import numpy as np
+import argparse
+import hashlib
 import sqlite3
 import json
 import os
@@ -29,6 +40,11 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(SCRIPT_DIR, '..', 'data', 'evaluations.db')
 FIGURES_DIR = os.path.join(SCRIPT_DIR, '..', 'docs', 'research', 'figures')
 OUTPUT_FILE = os.path.join(FIGURES_DIR, 'figure-transcript-comparison.png')
+# Flat boxes and text only, so Agg time scales with pixel count; 150 gives a
+# quarter of the pixels for drafts, paper builds keep 300
+DPI = int(os.environ.get('FIG_DPI', '300'))
+# zlib level for the PNG encoder; 1 is several times faster than the default 6
+PNG_COMPRESS = int(os.environ.get('FIG_PNG_COMPRESS', '1'))
 
 # Specific dialogue IDs chosen for maximum contrast within the same scenario
 # Both use Haiku ego model, Misconception Correction (4-turn) scenario, Sonnet judge
@@ -66,6 +82,18 @@ META_COLOR = '#95a5a6'
 BADGE_TEXT = '#ffffff'
 FIG_BG = '#ffffff'
 
+# ── Box styles ───────────────────────────────────────────────────────────────
+
+# Built once and shared, so FancyBboxPatch skips parsing "round,pad=..." per box
+BADGE_BOX = BoxStyle('Round', pad=0.005)
+CARD_BOX = BoxStyle('Round', pad=0.008)
+
+# Fonts for the per-card text, which is drawn once per turn per column
+TURN_FONT = FontProperties(size=7.5, weight='bold')
+TYPE_FONT = FontProperties(size=7, weight='bold')
+TITLE_FONT = FontProperties(size=8.5, weight='bold')
+BODY_FONT = FontProperties(family='serif', size=7.8)
+
 
 def get_db():
     """Open read-only connection to evaluation database."""
@@ -146,7 +174,12 @@ def format_cell_label(profile_name):
 def draw_column(ax, data, num_turns, x_start, col_width,
                 header_bg, header_text, card_bg, card_border,
                 score_bg, turn_label_color, condition_label):
-    """Draw one column of the transcript comparison."""
+    """Draw one column of the transcript comparison.
+
+    Text is added to ``ax`` directly; the column's box patches are returned
+    so the caller can add every column's boxes as one PatchCollection.
+    """
+    patches = []
     ax_height = 1.0  # normalized
     ax_width = 1.0
 
@@ -155,10 +188,10 @@ def draw_column(ax, data, num_turns, x_start, col_width,
     header_y = ax_height - header_height
     header = FancyBboxPatch(
         (x_start, header_y), col_width, header_height,
-        boxstyle="round,pad=0.005", facecolor=header_bg,
-        edgecolor='none', transform=ax.transAxes, zorder=5
+        boxstyle=BADGE_BOX, facecolor=header_bg,
+        edgecolor='none'
     )
-    ax.add_patch(header)
+    patches.append(header)
 
     # Condition label in header
     ax.text(
@@ -175,10 +208,10 @@ def draw_column(ax, data, num_turns, x_start, col_width,
     badge_x = x_start + col_width / 2 - badge_width / 2
     badge = FancyBboxPatch(
         (badge_x, badge_y), badge_width, badge_height,
-        boxstyle="round,pad=0.005", facecolor=score_bg,
-        edgecolor='none', transform=ax.transAxes, zorder=5
+        boxstyle=BADGE_BOX, facecolor=score_bg,
+        edgecolor='none'
     )
-    ax.add_patch(badge)
+    patches.append(badge)
     ax.text(
         x_start + col_width / 2, badge_y + badge_height / 2,
         f"Score: {data['score']:.1f}/100",
@@ -213,11 +246,10 @@ def draw_column(ax, data, num_turns, x_start, col_width,
         # Card background
         card = FancyBboxPatch(
             (x_start + 0.01, cy - card_height), col_width - 0.02, card_height,
-            boxstyle="round,pad=0.008", facecolor=card_bg,
-            edgecolor=card_border, linewidth=1.2,
-            transform=ax.transAxes, zorder=3
+            boxstyle=CARD_BOX, facecolor=card_bg,
+            edgecolor=card_border, linewidth=1.2
         )
-        ax.add_patch(card)
+        patches.append(card)
 
         # Turn number label
         turn_badge_w = 0.06
@@ -225,7 +257,7 @@ def draw_column(ax, data, num_turns, x_start, col_width,
         ax.text(
             x_start + 0.025, cy - 0.012,
             f"Turn {i + 1}",
-            transform=ax.transAxes, fontsize=7.5, fontweight='bold',
+            transform=ax.transAxes, fontproperties=TURN_FONT,
             color=turn_label_color, ha='left', va='center', zorder=6,
             bbox=dict(boxstyle='round,pad=0.15', facecolor='white',
                       edgecolor=turn_label_color, linewidth=0.7, alpha=0.9)
@@ -236,7 +268,7 @@ def draw_column(ax, data, num_turns, x_start, col_width,
         ax.text(
             x_start + 0.095, cy - 0.012,
             f"[{stype}]",
-            transform=ax.transAxes, fontsize=7, fontweight='bold',
+            transform=ax.transAxes, fontproperties=TYPE_FONT,
             color=card_border, ha='left', va='center', zorder=6
         )
 
@@ -247,7 +279,7 @@ def draw_column(ax, data, num_turns, x_start, col_width,
         ax.text(
             x_start + 0.025, cy - 0.038,
             title,
-            transform=ax.transAxes, fontsize=8.5, fontweight='bold',
+            transform=ax.transAxes, fontproperties=TITLE_FONT,
             color=BODY_COLOR, ha='left', va='center', zorder=6
         )
 
@@ -269,13 +301,32 @@ def draw_column(ax, data, num_turns, x_start, col_width,
             ax.text(
                 x_start + 0.025, text_y_start - j * line_spacing,
                 line,
-                transform=ax.transAxes, fontsize=7.8,
-                color=BODY_COLOR, ha='left', va='center', zorder=6,
-                family='serif'
+                transform=ax.transAxes, fontproperties=BODY_FONT,
+                color=BODY_COLOR, ha='left', va='center', zorder=6
             )
 
+    return patches
+
 
-def generate_figure():
+def render_key(db_path):
+    """Hash of everything the output PNG depends on."""
+    h = hashlib.blake2b(digest_size=8)
+    with open(__file__, 'rb') as f:
+        h.update(f.read())
+    h.update(repr((os.path.getmtime(db_path), DPI, PNG_COMPRESS)).encode())
+    return h.hexdigest()
+
+
+def is_current(key):
+    """True if OUTPUT_FILE was rendered from the inputs hashed in ``key``."""
+    try:
+        with Image.open(OUTPUT_FILE) as im:
+            return im.text.get('Source-Hash') == key
+    except OSError:
+        return False
+
+
+def generate_figure(key):
     """Generate the transcript comparison figure."""
     conn = get_db()
 
@@ -322,18 +373,23 @@ def generate_figure():
     right_x = left_x + col_width + col_gap
 
     # Draw columns
-    draw_column(
+    patches = draw_column(
         ax, base_data, NUM_TURNS, left_x, col_width,
         BASE_HEADER_BG, BASE_HEADER_TEXT, BASE_CARD_BG, BASE_CARD_BORDER,
         BASE_SCORE_BG, BASE_TURN_LABEL,
         'Base Condition'
     )
-    draw_column(
+    patches += draw_column(
         ax, recog_data, NUM_TURNS, right_x, col_width,
         RECOG_HEADER_BG, RECOG_HEADER_TEXT, RECOG_CARD_BG, RECOG_CARD_BORDER,
         RECOG_SCORE_BG, RECOG_TURN_LABEL,
         'Recognition Condition'
     )
+    # One collection draws every header, badge and card in a single Agg pass;
+    # patches carry their own colors, and the boxes never overlap each other
+    ax.add_collection(PatchCollection(
+        patches, match_original=True, transform=ax.transAxes, zorder=3
+    ))
 
     # ── Vertical divider ──
     divider_x = left_x + col_width + col_gap / 2
@@ -354,11 +410,25 @@ def generate_figure():
 
     # Save
     os.makedirs(FIGURES_DIR, exist_ok=True)
-    fig.savefig(OUTPUT_FILE, dpi=300, bbox_inches='tight', facecolor=FIG_BG)
+    fig.savefig(OUTPUT_FILE, dpi=DPI, bbox_inches='tight', facecolor=FIG_BG,
+                metadata={'Source-Hash': key}, pil_kwargs={'compress_level': PNG_COMPRESS})
     plt.close(fig)
     print(f"\nSaved: {OUTPUT_FILE}")
     print(f"Size: {os.path.getsize(OUTPUT_FILE) / 1024:.0f} KB")
 
 
+def main():
+    parser = argparse.ArgumentParser(description='Generate the transcript comparison figure.')
+    parser.add_argument('--force', action='store_true',
+                        help='re-render even if the PNG is up to date')
+    args = parser.parse_args()
+
+    key = render_key(DB_PATH)
+    if not args.force and is_current(key):
+        print(f"Up to date: {OUTPUT_FILE}")
+        return
+    generate_figure(key)
+
+
 if __name__ == '__main__':
-    generate_figure()
+    main()
@@ -5,26 +5,53 @@ tutor language in messages-mode cells (80-87).
 
 Usage:
     python scripts/generate-word-clouds.py
+    FIG_DPI=150 python scripts/generate-word-clouds.py          # draft render
+    FIG_PNG_COMPRESS=9 python scripts/generate-word-clouds.py   # smallest file
+    python scripts/generate-word-clouds.py --force              # re-render even if current
+
+The PNG records a hash of the database mtime, cell lists, DPI, PNG
+compression and this script; when none of those have changed the render is skipped.
 
 Output:
     docs/research/figures/figure-word-clouds.png
 """
 
+import argparse
+import hashlib
+import inspect
 import json
 import os
+import pickle
+import re
 import sqlite3
 import sys
+from collections import Counter
+from random import Random
 
 import matplotlib
 matplotlib.use('Agg')  # Non-interactive backend
 import matplotlib.pyplot as plt
 from matplotlib.colors import LinearSegmentedColormap
+import numpy as np
+from PIL import Image
 from wordcloud import WordCloud
 
 # --- Configuration ---
 
 DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'evaluations.db')
 OUTPUT_PATH = os.path.join(os.path.dirname(__file__), '..', 'docs', 'research', 'figures', 'figure-word-clouds.png')
+# Extracted text is reused while evaluations.db and the extraction code are
+# unchanged; kept next to the DB, outside the published docs/research tree
+CACHE_PATH = os.path.join(os.path.dirname(DB_PATH), '.figure-word-clouds-cache.pkl')
+
+# Paper builds use 300; word clouds are rendered at the matching pixel size
+DPI = int(os.environ.get('FIG_DPI', '300'))
+CANVAS_WIDTH, CANVAS_HEIGHT = 800, 600
+# Layout seed; each panel is laid out from a fresh Random with this seed
+RANDOM_SEED = 42
+# zlib level for the PNG; this ~4800x2100 image spends most of savefig in
+# deflate, and level 1 is several times faster than the default 6
+PNG_COMPRESS = int(os.environ.get('FIG_PNG_COMPRESS', '1'))
 
 BASE_CELLS = [
     'cell_80_messages_base_single_unified',
@@ -42,7 +69,7 @@ RECOG_CELLS = [
 
 # Stopwords: English common words + generic pedagogical terms
 # that appear equally across both conditions
-STOPWORDS = {
+STOPWORDS = frozenset({
     # Common English
     'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
     'of', 'with', 'by', 'from', 'is', 'are', 'was', 'were', 'be', 'been',
@@ -82,26 +109,12 @@ STOPWORDS = {
 
     # Markdown / formatting artifacts
     'http', 'https', 'www', 'com', 'org', 'html',
-}
+})
 
 
-def extract_messages(db_path, cell_names):
-    """Extract tutor message text from suggestions JSON for given cells."""
-    conn = sqlite3.connect(db_path)
-    placeholders = ','.join('?' for _ in cell_names)
-    query = f"""
-        SELECT suggestions
-        FROM evaluation_results
-        WHERE profile_name IN ({placeholders})
-          AND suggestions IS NOT NULL
-          AND suggestions != '[]'
-    """
-    cursor = conn.execute(query, cell_names)
-    rows = cursor.fetchall()
-    conn.close()
-
+def _parse_suggestions(rows):
+    """Pure-Python fallback for SQLite builds without the JSON1 functions."""
     texts = []
-    n_responses = 0
     for (suggestions_json,) in rows:
         try:
             suggestions = json.loads(suggestions_json)
@@ -111,40 +124,192 @@ def extract_messages(db_path, cell_names):
                         msg = suggestion['message']
                         if msg and isinstance(msg, str):
                             texts.append(msg)
-                            n_responses += 1
         except (json.JSONDecodeError, TypeError):
             continue
+    return texts
+
+
+def extract_messages(conn, cell_names):
+    """Extract tutor message text from suggestions JSON for given cells."""
+    placeholders = ','.join('?' for _ in cell_names)
+    where = f"""
+        WHERE profile_name IN ({placeholders})
+          AND suggestions IS NOT NULL
+          AND suggestions != '[]'
+    """
+    # Let SQLite's JSON1 flatten suggestions[].message and join the messages
+    # in one C-level pass, returning a single (text, count) row; malformed or
+    # non-array payloads are swapped for '[]' so they yield no rows, and
+    # non-object elements reach the path functions as NULL, since a bare
+    # string element is not valid JSON and would fail the whole query. Message
+    # order is irrelevant, since the text is only tokenized and counted
+    json_query = f"""
+        SELECT group_concat(msg, ' '), count(*) FROM (
+            SELECT json_extract(CASE WHEN s.type = 'object' THEN s.value END, '$.message') AS msg
+            FROM evaluation_results,
+                 json_each(CASE WHEN json_valid(suggestions) AND json_type(suggestions) = 'array'
+                                THEN suggestions ELSE '[]' END) AS s
+            {where}
+              AND json_type(CASE WHEN s.type = 'object' THEN s.value END, '$.message') = 'text'
+              AND json_extract(CASE WHEN s.type = 'object' THEN s.value END, '$.message') != ''
+        )
+    """
+    try:
+        combined, n = conn.execute(json_query, cell_names).fetchone()
+        combined = combined or ''
+    except sqlite3.OperationalError:
+        texts = _parse_suggestions(conn.execute(f"SELECT suggestions FROM evaluation_results {where}", cell_names))
+        combined, n = ' '.join(texts), len(texts)
 
-    # Normalize case so "Master"/"master", "Servant"/"servant" etc. merge
-    combined = ' '.join(texts).lower()
-    return combined, n_responses
+    # Normalize case so "Master"/"master", "Servant"/"servant" etc. merge.
+    # Done in Python: SQLite's lower() only folds ASCII
+    return combined.lower(), n
 
 
-def create_word_cloud(text, colormap, max_words=200):
+def load_messages(db_path):
+    """Return (base_text, base_n, recog_text, recog_n), cached on the DB mtime.
+
+    The cache key also covers the extraction code, so editing the SQL or the
+    JSON parsing does not reuse text extracted by the old version.
+    """
+    extract_src = inspect.getsource(extract_messages) + inspect.getsource(_parse_suggestions)
+    key = (os.path.getmtime(db_path), tuple(BASE_CELLS), tuple(RECOG_CELLS),
+           hashlib.blake2b(extract_src.encode(), digest_size=8).hexdigest())
+    try:
+        with open(CACHE_PATH, 'rb') as f:
+            cached_key, payload = pickle.load(f)
+        if cached_key == key:
+            return payload
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        pass
+
+    # One connection for both conditions: the cell lists are the same length,
+    # so the second query is the same SQL text and reuses the cached statement
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    try:
+        payload = extract_messages(conn, BASE_CELLS) + extract_messages(conn, RECOG_CELLS)
+    finally:
+        conn.close()
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    with open(CACHE_PATH, 'wb') as f:
+        pickle.dump((key, payload), f, protocol=pickle.HIGHEST_PROTOCOL)
+    return payload
+
+
+def render_key(db_path):
+    """Hash of everything the output PNG depends on."""
+    h = hashlib.blake2b(digest_size=8)
+    with open(__file__, 'rb') as f:
+        h.update(f.read())
+    h.update(repr((os.path.getmtime(db_path), BASE_CELLS, RECOG_CELLS, DPI, PNG_COMPRESS)).encode())
+    return h.hexdigest()
+
+
+def is_current(key):
+    """True if OUTPUT_PATH was rendered from the inputs hashed in ``key``."""
+    try:
+        with Image.open(OUTPUT_PATH) as im:
+            return im.text.get('Source-Hash') == key
+    except OSError:
+        return False
+
+
+# WordCloud.process_text's tokenizer (min_word_length=0): contractions stay
+# one token ("won't") and \w keeps non-ASCII letters inside words ("café")
+_WORD_RE = re.compile(r"\w[\w']*")
+
+
+def text_to_freq(text, stopwords=STOPWORDS):
+    """Count tokens as WordCloud.process_text does, without collocations.
+
+    Drops a trailing 's, all-digit tokens and stopwords, and folds plurals
+    into their singular. Counts and first-occurrence order match
+    process_text, so most_common() breaks ties the same way WordCloud would.
+    """
+    # Count every token, then apply the per-token rules once per distinct
+    # token and delete the stopwords that occurred. Rebuilding in
+    # first-occurrence order puts "x's" at whichever of "x" and "x's" came
+    # first, as stripping before counting would
+    counts = Counter()
+    for word, n in Counter(_WORD_RE.findall(text)).items():
+        if word.endswith("'s"):
+            word = word[:-2]
+        if not word.isdigit():
+            counts[word] += n
+    for word in counts.keys() & stopwords:
+        del counts[word]
+    for word in [w for w in counts if w.endswith('s') and not w.endswith('ss')]:
+        if word[:-1] in counts:
+            counts[word[:-1]] += counts.pop(word)
+    return counts
+
+
+def create_word_cloud(scale=1.0, max_words=200):
     """Create a WordCloud object with specified parameters."""
-    wc = WordCloud(
-        width=800,
-        height=600,
+    return WordCloud(
+        width=CANVAS_WIDTH,
+        height=CANVAS_HEIGHT,
+        scale=scale,
         max_words=max_words,
-        stopwords=STOPWORDS,
-        colormap=colormap,
         background_color='white',
         min_font_size=8,
         max_font_size=80,
         relative_scaling=0.5,
         prefer_horizontal=0.7,
-        random_state=42,
+        random_state=RANDOM_SEED,
         collocations=False,  # Avoid duplicate bigrams
     )
-    wc.generate(text)
-    return wc
+
+
+def colormap_color_func(cmap):
+    """WordCloud color_func picking from ``cmap``'s colors, formatted once up front.
+
+    Draws from random_state and rounds exactly as WordCloud's own
+    colormap_color_func does, so each word gets the same colour it would
+    there; only the per-word colormap call and string formatting are gone.
+    """
+    lut = ['rgb({:.0f}, {:.0f}, {:.0f})'.format(*np.maximum(0, 255 * np.array(cmap(i)))[:3])
+           for i in range(cmap.N)]
+    last = cmap.N - 1
+
+    def color_func(word, font_size, position, orientation, random_state=None, **kwargs):
+        # cmap(u) for a float u in [0, 1] looks up entry int(u * N)
+        return lut[min(int(random_state.uniform(0, 1) * cmap.N), last)]
+
+    return color_func
+
+
+def render_word_cloud(wc, text, colormap):
+    """Lay out ``text`` on the shared WordCloud and return (RGBA array, word weights)."""
+    # Reseed for each panel: WordCloud keeps one Random across layouts, so a
+    # second layout would otherwise continue the first one's stream rather
+    # than start from random_state=42 as a fresh WordCloud does
+    wc.random_state = Random(RANDOM_SEED)
+    # Colours are drawn during the layout, interleaved with placement, as
+    # they are when the colormap is passed to WordCloud itself
+    wc.color_func = colormap_color_func(colormap)
+    # WordCloud only lays out the max_words most frequent words; pick them with
+    # a heap rather than having it sort the whole vocabulary (ties keep order)
+    wc.generate_from_frequencies(dict(text_to_freq(text).most_common(wc.max_words)))
+    # Opaque RGBA: imshow would otherwise dstack an alpha channel onto the
+    # RGB buffer on every draw, about 40% of its draw time at this size
+    return np.asarray(wc.to_image().convert('RGBA')), dict(wc.words_)
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Generate the base vs recognition word clouds.')
+    parser.add_argument('--force', action='store_true',
+                        help='re-render even if the PNG is up to date')
+    args = parser.parse_args()
+
+    key = render_key(DB_PATH)
+    if not args.force and is_current(key):
+        print(f"Up to date: {OUTPUT_PATH}")
+        return
+
     print("Extracting tutor messages from database...")
 
-    base_text, base_n = extract_messages(DB_PATH, BASE_CELLS)
-    recog_text, recog_n = extract_messages(DB_PATH, RECOG_CELLS)
+    base_text, base_n, recog_text, recog_n = load_messages(DB_PATH)
 
     print(f"  Base condition:        {base_n:,} responses, {len(base_text):,} chars")
     print(f"  Recognition condition: {recog_n:,} responses, {len(recog_text):,} chars")
@@ -167,20 +332,11 @@ def main():
         N=256
     )
 
-    print("Generating word clouds...")
-    base_wc = create_word_cloud(base_text, base_cmap)
-    recog_wc = create_word_cloud(recog_text, recog_cmap)
-
     # Create figure
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7), dpi=300)
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7), dpi=DPI)
 
-    # Base panel
-    ax1.imshow(base_wc, interpolation='bilinear')
     ax1.set_title('Base Condition', fontsize=16, fontweight='bold', pad=12, color='#2C3E50')
     ax1.axis('off')
-
-    # Recognition panel
-    ax2.imshow(recog_wc, interpolation='bilinear')
     ax2.set_title('Recognition Condition', fontsize=16, fontweight='bold', pad=12, color='#1B7A4E')
     ax2.axis('off')
 
@@ -195,19 +351,36 @@ def main():
         ha='center', fontsize=12, color='#555555', style='italic'
     )
 
-    plt.tight_layout(rect=[0, 0.02, 1, 0.90])
+    # The margins tight_layout(rect=[0, 0.02, 1, 0.90]) solves for: both axes
+    # are off and the titles are fixed, so they do not depend on the data or DPI
+    fig.subplots_adjust(left=0.009375, right=0.990625, bottom=0.04142857, top=0.76936508,
+                        wspace=0.0192926)
+
+    # Lay out at the fixed canvas size, then rasterize at the panel's on-screen
+    # pixel size so imshow maps pixels 1:1 instead of resampling
+    panel = ax1.get_window_extent()
+    scale = min(panel.width / CANVAS_WIDTH, panel.height / CANVAS_HEIGHT)
+
+    print("Generating word clouds...")
+    # The two panels share one configured WordCloud; each render snapshots
+    # its array and weights before the next layout overwrites them
+    wc = create_word_cloud(scale)
+    base_img, base_freq = render_word_cloud(wc, base_text, base_cmap)
+    recog_img, recog_freq = render_word_cloud(wc, recog_text, recog_cmap)
+
+    ax1.imshow(base_img, interpolation='nearest')
+    ax2.imshow(recog_img, interpolation='nearest')
 
     # Save
     os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-    fig.savefig(OUTPUT_PATH, dpi=300, bbox_inches='tight', facecolor='white', edgecolor='none')
+    fig.savefig(OUTPUT_PATH, dpi=DPI, bbox_inches='tight', facecolor='white', edgecolor='none',
+                metadata={'Source-Hash': key}, pil_kwargs={'compress_level': PNG_COMPRESS})
     plt.close(fig)
 
     print(f"Saved to: {OUTPUT_PATH}")
 
     # Print top words for verification
     print("\nTop 15 words per condition:")
-    base_freq = base_wc.words_
-    recog_freq = recog_wc.words_
     print(f"\n  {'Base':<30s} {'Recognition':<30s}")
     print(f"  {'─' * 28}   {'─' * 28}")
     base_items = list(base_freq.items())[:15]
@@ -340,6 +340,9 @@ export function migrateEvaluationDatabase(db) {
   db.exec(
     `CREATE INDEX IF NOT EXISTS idx_results_attempt ON evaluation_results(run_id, profile_name, scenario_id, attempt_index)`,
   );
+  // Analysis scripts (e.g. scripts/generate-word-clouds.py) select by cell
+  // across runs with `profile_name IN (...)`, which idx_results_attempt can't serve.
+  db.exec(`CREATE INDEX IF NOT EXISTS idx_results_profile ON evaluation_results(profile_name)`);
 
   // P0 Provenance: score audit trail (append-only). `result_id` is an INTEGER
   // because it names evaluation_results.id; scoreAuditRetype.js repairs older